@@ -2,46 +2,76 @@
 
 from __future__ import annotations
 
+import csv
 import os
+import statistics
 import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import (
+    datetime,
+    timezone,
+)
+from pathlib import Path  # noqa: TC003
 from typing import (
     Any,
     Dict,
     Optional,
     Tuple,
+    Union,
 )
 
 import typer
 from dotenv import load_dotenv
 from loguru import logger
-from pydantic import BaseModel
 from typing_extensions import Annotated
 
+from anef_checker.constants.anef_constants import BASE_URL
 from anef_checker.constants.anef_enums import (
     APICodeEnum,
+    JobStateEnum,
     LanguageEnum,
 )
-from anef_checker.controllers.anef_status_checker import (
-    BASE_URL,
-    ANEFCredentials,
-    check_naturalization_status,
+from anef_checker.controllers.anef_status_checker import ANEFCredentials
+from anef_checker.controllers.asset_proxy import (
+    DEFAULT_MAX_DISK_BYTES,
+    DEFAULT_MAX_MEMORY_BYTES,
+    AssetCacheProxy,
+)
+from anef_checker.controllers.capacity import (
+    DEFAULT_MEMORY_RESERVE_BYTES,
+    MIB,
+    CapacityController,
+)
+from anef_checker.controllers.check_queue import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_VISIBILITY_TIMEOUT,
+    CheckJob,
+    open_broker,
+    run_worker,
+)
+from anef_checker.controllers.checker_backends import (
+    CHECKER_BACKENDS,
+    CheckerBackend,
+    SyntheticBackend,
+    get_checker_backend,
 )
 from anef_checker.controllers.database import get_status_description
+from anef_checker.controllers.paths import get_cache_dir
+from anef_checker.controllers.status_cache import (
+    load_cached_status,
+    save_cached_status,
+)
+from anef_checker.models.anef_status import StatusCheckResult
 
 load_dotenv()
 
 app = typer.Typer(help='CLI tool for checking naturalization status.')
 
 
-class StatusCheckResult(BaseModel):
-    """Pydantic class to hold the status check result."""
-
-    success: bool
-    api_code: Optional[APICodeEnum] = None
-    description: Optional[str] = None
-    error_message: Optional[str] = None
-
-
 def setup_logging() -> None:
     """Set logging for the CLI."""
     logger.remove()
@@ -85,43 +115,71 @@ def process_status_result(result: Dict[str, Any], language: LanguageEnum) -> Sta
         if not status_description:
             status_description = api_code.value
 
-        return StatusCheckResult(success=True, api_code=api_code, description=status_description)
-    except ValueError:
+        return StatusCheckResult(
+            success=True,
+            api_code=api_code,
+            description=status_description,
+            checked_at=datetime.now(tz=timezone.utc),
+        )
+    except (KeyError, ValueError):
         return StatusCheckResult(success=False, error_message=f"Unknown status code: {result.get('statut')}")
 
 
-def check_status_core(
+def check_status_core(  # noqa: PLR0913
     username: Optional[str],
     password: Optional[str],
     url: Optional[str],
     language: LanguageEnum = LanguageEnum.FR,
+    *,
+    max_age: Optional[float] = None,
+    trace_dir: Optional[Path] = None,
+    backend: Union[str, CheckerBackend, None] = None,
+    cache_dir: Optional[Path] = None,
 ) -> StatusCheckResult:
     """Check naturalization status using provided credentials.
 
     Core function to check naturalization status.
     Can be used by both CLI and GUI interfaces.
+    When ``max_age`` is given, a last-known status younger than ``max_age`` seconds is returned without checking.
+    When ``trace_dir`` is given, a performance trace of the check is written there.
+    ``backend`` is a checker backend or its name; it defaults to ``ANEF_CHECKER_BACKEND`` or ``selenium``.
+    Last-known statuses are read from and saved to ``cache_dir`` (the user cache by default), only for backends that
+    cache their results.
     """
     # Validate credentials
     is_valid, credentials, error = validate_credentials(username, password, url)
-    if not is_valid:
-        return StatusCheckResult(success=False, error_message=error)
-    if not credentials:
-        return StatusCheckResult(success=False, error_message='Missing required credentials.')
+    if not is_valid or not credentials:
+        return StatusCheckResult(success=False, error_message=error or 'Missing required credentials.')
+
+    if backend is None or isinstance(backend, str):
+        try:
+            backend = get_checker_backend(backend)
+        except ValueError as e:
+            return StatusCheckResult(success=False, error_message=str(e))
+
+    # Use the last-known status if it is recent enough
+    if max_age is not None and backend.caches_results:
+        cached = load_cached_status(credentials.username, cache_dir=cache_dir)
+        if cached and cached.age.total_seconds() <= max_age:
+            return cached.to_result(language)
 
     # Check status
     try:
-        result = check_naturalization_status(credentials)
+        result = backend.check(credentials, trace_dir=trace_dir)
         if not result:
             return StatusCheckResult(success=False, error_message='No response received from server.')
     except RuntimeError as e:
         return StatusCheckResult(success=False, error_message=f'Error checking status: {str(e)}')
 
     # Process result
-    return process_status_result(result, language)
+    status = process_status_result(result, language)
+    if status.success and backend.caches_results:
+        save_cached_status(credentials.username, status, language, cache_dir=cache_dir)
+    return status
 
 
 @app.command('check')
-def check_status(
+def check_status(  # noqa: PLR0913, PLR0917
     username: Annotated[Optional[str], typer.Option('-n', '--username', help='ANEF web username.')] = os.getenv(
         'ANEF_WEB_USERNAME',
     ),
@@ -139,6 +197,18 @@ def check_status(
         LanguageEnum,
         typer.Option('-l', '--language', help='Language for status description.'),
     ] = LanguageEnum.FR,
+    max_age: Annotated[
+        Optional[float],
+        typer.Option('--max-age', help='Return the last-known status if it is younger than this many seconds.'),
+    ] = None,
+    trace_dir: Annotated[
+        Optional[Path],
+        typer.Option('--trace-dir', help='Write a performance trace and summary of the check to this directory.'),
+    ] = None,
+    backend: Annotated[
+        Optional[str],
+        typer.Option('-b', '--backend', help=f'Checker backend: {", ".join(CHECKER_BACKENDS)}.'),
+    ] = os.getenv('ANEF_CHECKER_BACKEND'),
     verbose: Annotated[bool, typer.Option('-v', '--verbose', help='Enable verbose logging.')] = False,  # noqa: FBT002
 ) -> None:
     """Check naturalization status using provided credentials."""
@@ -148,17 +218,287 @@ def check_status(
         setup_logging()
     logger.info(f'Checking naturalization status for {username}...')
 
-    result = check_status_core(username, password, url, language)
+    result = check_status_core(
+        username,
+        password,
+        url,
+        language,
+        max_age=max_age,
+        trace_dir=trace_dir,
+        backend=backend,
+    )
 
     if not result.success:
         logger.error(result.error_message)
         raise typer.Exit(code=1)
 
+    if result.from_cache and result.checked_at:
+        logger.info(f'Last-known status, checked at {result.checked_at.astimezone():%Y-%m-%d %H:%M:%S}')
+
     if result.api_code:
         logger.success(f'   API code: {result.api_code.name}')
     if result.description:
         logger.success(f'Description: {result.description}')
 
 
+@app.command('proxy')
+def run_asset_proxy(  # noqa: PLR0913, PLR0917
+    host: Annotated[str, typer.Option('--host', help='Address to listen on.')] = '127.0.0.1',
+    port: Annotated[int, typer.Option('--port', help='Port to listen on.')] = 8899,
+    cache_dir: Annotated[
+        Optional[Path],
+        typer.Option('--cache-dir', help='Directory for the on-disk asset cache.'),
+    ] = None,
+    max_memory_mb: Annotated[
+        int,
+        typer.Option('--max-memory-mb', help='In-memory cache budget in MiB.'),
+    ] = DEFAULT_MAX_MEMORY_BYTES // (1024 * 1024),
+    max_disk_mb: Annotated[
+        int,
+        typer.Option('--max-disk-mb', help='On-disk cache budget in MiB.'),
+    ] = DEFAULT_MAX_DISK_BYTES // (1024 * 1024),
+    tls_cert: Annotated[
+        Optional[Path],
+        typer.Option('--tls-cert', help='Certificate used to intercept HTTPS for the ANEF host.'),
+    ] = None,
+    tls_key: Annotated[Optional[Path], typer.Option('--tls-key', help='Private key of --tls-cert.')] = None,
+    stats_interval: Annotated[int, typer.Option('--stats-interval', help='Seconds between stats logs.')] = 60,
+) -> None:
+    """Run a caching proxy for ANEF static assets; point checkers at it with ANEF_ASSET_PROXY."""
+    setup_logging()
+    proxy = AssetCacheProxy(
+        host=host,
+        port=port,
+        cache_dir=cache_dir or get_cache_dir() / 'assets',
+        max_memory_bytes=max_memory_mb * 1024 * 1024,
+        max_disk_bytes=max_disk_mb * 1024 * 1024,
+        tls_cert_file=tls_cert,
+        tls_key_file=tls_key,
+    )
+    with proxy:
+        logger.info(f'Export ANEF_ASSET_PROXY={proxy.url} for the checkers to use this proxy.')
+        try:
+            while True:
+                time.sleep(stats_interval)
+                logger.info(f'Asset cache stats: {proxy.stats.model_dump()}')
+        except KeyboardInterrupt:
+            pass
+
+
+@app.command('enqueue')
+def enqueue_checks(
+    accounts_file: Annotated[
+        Path,
+        typer.Argument(help='CSV file with "username" and "password" columns, and an optional "url" column.'),
+    ],
+    language: Annotated[
+        LanguageEnum,
+        typer.Option('-l', '--language', help='Language for status description.'),
+    ] = LanguageEnum.FR,
+    queue_url: Annotated[
+        Optional[str],
+        typer.Option('-q', '--queue', help='Queue URL, e.g. sqlite:///path/to/queue.db.'),
+    ] = None,
+    max_attempts: Annotated[int, typer.Option('--max-attempts', help='Deliveries before a job fails.')] = (
+        DEFAULT_MAX_ATTEMPTS
+    ),
+) -> None:
+    """Enqueue one status check per account for distributed workers."""
+    setup_logging()
+    with accounts_file.open('r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        missing_columns = {'username', 'password'} - set(reader.fieldnames or [])
+        if missing_columns:
+            logger.error(f'{accounts_file} has no {", ".join(sorted(missing_columns))} column.')
+            raise typer.Exit(code=1)
+        accounts = list(reader)
+    # Line 1 is the header
+    incomplete_lines = [
+        line for line, account in enumerate(accounts, start=2) if not account['username'] or not account['password']
+    ]
+    if incomplete_lines:
+        logger.error(f'Missing username or password in {accounts_file} on lines {incomplete_lines}.')
+        raise typer.Exit(code=1)
+
+    broker = open_broker(queue_url)
+    for account in accounts:
+        broker.enqueue(
+            username=account['username'],
+            password=account['password'],
+            url=account.get('url') or None,
+            language=language,
+            max_attempts=max_attempts,
+        )
+    logger.success(f'Enqueued {len(accounts)} status checks.')
+
+
+def check_job(job: CheckJob) -> Dict[str, Any]:
+    """Run the status check of a queued job and return the result to report.
+
+    A failed check raises ``RuntimeError`` so that the job is retried until it runs out of attempts.
+    """
+    result = check_status_core(job.username, job.password.get_secret_value(), job.url, job.language)
+    if not result.success:
+        raise RuntimeError(result.error_message or 'Status check failed.')
+    return result.model_dump(mode='json')
+
+
+@app.command('worker')
+def run_check_worker(  # noqa: PLR0913, PLR0917
+    queue_url: Annotated[
+        Optional[str],
+        typer.Option('-q', '--queue', help='Queue URL, e.g. sqlite:///path/to/queue.db.'),
+    ] = None,
+    visibility_timeout: Annotated[
+        float,
+        typer.Option('--visibility-timeout', help='Seconds before an unacknowledged job is re-delivered.'),
+    ] = DEFAULT_VISIBILITY_TIMEOUT,
+    poll_interval: Annotated[
+        float,
+        typer.Option('--poll-interval', help='Seconds to wait when the queue is empty.'),
+    ] = DEFAULT_POLL_INTERVAL,
+    max_jobs: Annotated[Optional[int], typer.Option('--max-jobs', help='Exit after this many jobs.')] = None,
+    min_sessions: Annotated[
+        int,
+        typer.Option('--min-sessions', help='Browser sessions always allowed to run concurrently.'),
+    ] = 1,
+    max_sessions: Annotated[
+        int,
+        typer.Option('--max-sessions', help='Upper bound of concurrent browser sessions, sized to the host.'),
+    ] = 1,
+    memory_reserve_mb: Annotated[
+        int,
+        typer.Option('--memory-reserve-mb', help='Memory in MiB kept free for the rest of the host.'),
+    ] = DEFAULT_MEMORY_RESERVE_BYTES // MIB,
+    verbose: Annotated[bool, typer.Option('-v', '--verbose', help='Enable verbose logging.')] = False,  # noqa: FBT002
+) -> None:
+    """Lease status checks from the queue and report their results."""
+    if verbose:
+        setup_logging_verbose()
+    else:
+        setup_logging()
+    capacity = None
+    if max_sessions > 1:
+        capacity = CapacityController(
+            min_sessions=min_sessions,
+            max_sessions=max_sessions,
+            memory_reserve_bytes=memory_reserve_mb * MIB,
+        )
+    try:
+        processed = run_worker(
+            open_broker(queue_url),
+            check_job,
+            visibility_timeout=visibility_timeout,
+            poll_interval=poll_interval,
+            max_jobs=max_jobs,
+            capacity=capacity,
+        )
+    except KeyboardInterrupt:
+        return
+    logger.info(f'Worker processed {processed} jobs.')
+
+
+@app.command('results')
+def show_results(
+    queue_url: Annotated[
+        Optional[str],
+        typer.Option('-q', '--queue', help='Queue URL, e.g. sqlite:///path/to/queue.db.'),
+    ] = None,
+    state: Annotated[
+        Optional[JobStateEnum],
+        typer.Option('-s', '--state', help='Only show jobs in this state.'),
+    ] = None,
+) -> None:
+    """Show the queued status checks and their results."""
+    setup_logging()
+    for job in open_broker(queue_url).list_jobs(state):
+        if job.result and job.result.get('success'):
+            outcome = f"{job.result.get('api_code')}: {job.result.get('description')}"
+        elif job.result:
+            outcome = job.result.get('error_message') or ''
+        else:
+            outcome = job.error or ''
+        logger.info(f'{job.job_id} {job.username} [{job.state.value}, attempts={job.attempts}] {outcome}')
+
+
+@app.command('loadtest')
+def run_load_test(  # noqa: PLR0913, PLR0917
+    checks: Annotated[int, typer.Option('--checks', min=1, help='Number of synthetic checks to run.')] = 10000,
+    concurrency: Annotated[int, typer.Option('--concurrency', min=1, help='Checks running at the same time.')] = 8,
+    accounts: Annotated[int, typer.Option('--accounts', min=1, help='Number of distinct synthetic accounts.')] = 100,
+    latency_mean: Annotated[
+        float,
+        typer.Option('--latency-mean', min=0.0, help='Mean simulated check latency in seconds.'),
+    ] = 0.0,
+    timeout_rate: Annotated[
+        float,
+        typer.Option('--timeout-rate', min=0.0, max=1.0, help='Share of checks returning no status.'),
+    ] = 0.01,
+    error_rate: Annotated[
+        float,
+        typer.Option('--error-rate', min=0.0, max=1.0, help='Share of checks raising an error.'),
+    ] = 0.001,
+    unknown_code_rate: Annotated[
+        float,
+        typer.Option(
+            '--unknown-code-rate',
+            min=0.0,
+            max=1.0,
+            help='Share of checks returning an unknown status code.',
+        ),
+    ] = 0.0,
+    language: Annotated[
+        LanguageEnum,
+        typer.Option('-l', '--language', help='Language for status description.'),
+    ] = LanguageEnum.FR,
+    seed: Annotated[Optional[int], typer.Option('--seed', help='Random seed of the synthetic backend.')] = None,
+) -> None:
+    """Push synthetic status checks through check_status_core and report throughput and latency.
+
+    Results are cached in a temporary directory, not in the user cache.
+    """
+    setup_logging()
+    backend = SyntheticBackend(
+        latency_mean=latency_mean,
+        timeout_rate=timeout_rate,
+        error_rate=error_rate,
+        unknown_code_rate=unknown_code_rate,
+        seed=seed,
+        caches_results=True,
+    )
+    latencies = []
+    outcomes: Counter[str] = Counter()
+    with tempfile.TemporaryDirectory() as cache_dir:
+
+        def run_check(index: int) -> Tuple[float, StatusCheckResult]:
+            start = time.perf_counter()
+            result = check_status_core(
+                f'user{index % accounts}@example.org',
+                'password',
+                None,
+                language,
+                backend=backend,
+                cache_dir=Path(cache_dir),
+            )
+            return time.perf_counter() - start, result
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for latency, result in pool.map(run_check, range(checks)):
+                latencies.append(latency)
+                outcomes['success' if result.success else result.error_message or 'error'] += 1
+        elapsed = time.perf_counter() - start
+
+    logger.success(f'{checks} checks in {elapsed:.2f}s: {checks / elapsed * 60:.0f} checks/min')
+    if len(latencies) > 1:
+        percentiles = statistics.quantiles(latencies, n=100)
+        logger.info(
+            f'Latency p50={percentiles[49] * 1000:.2f}ms p95={percentiles[94] * 1000:.2f}ms '
+            f'p99={percentiles[98] * 1000:.2f}ms max={max(latencies) * 1000:.2f}ms',
+        )
+    for outcome, count in outcomes.most_common():
+        logger.info(f'{count:>8} {outcome}')
+
+
 if __name__ == '__main__':
     app()
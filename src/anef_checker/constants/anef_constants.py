@@ -0,0 +1,10 @@
+"""Constants shared by the anef_checker interfaces.
+
+Kept free of heavy imports so that the GUI can read them before loading the checker.
+"""
+
+from __future__ import annotations
+
+from typing import Final
+
+BASE_URL: Final[str] = 'https://administration-etrangers-en-france.interieur.gouv.fr'
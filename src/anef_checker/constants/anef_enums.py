@@ -85,3 +85,12 @@ class LanguageEnum(str, Enum):
     EN = 'en'
     FR = 'fr'
     ES = 'es'
+
+
+class JobStateEnum(str, Enum):
+    """States of a status check job in the distributed check queue."""
+
+    PENDING = 'pending'
+    LEASED = 'leased'
+    DONE = 'done'
+    FAILED = 'failed'
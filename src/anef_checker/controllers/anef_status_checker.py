@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+import json
 import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path  # noqa: TC003
 from typing import (
     TYPE_CHECKING,
     Any,
     Dict,
     Final,
+    Iterator,
+    List,
     Optional,
 )
 
@@ -18,6 +27,7 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    PrivateAttr,
     SecretStr,
 )
 from selenium import webdriver
@@ -26,15 +36,28 @@ if TYPE_CHECKING:
     from selenium.webdriver.chrome.webdriver import WebDriver
     from selenium.webdriver.remote.webelement import WebElement
 
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import (
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.wait import WebDriverWait
 
+from anef_checker.constants.anef_constants import BASE_URL
+from anef_checker.controllers.check_trace import (
+    TraceSummary,
+    format_trace_summary,
+    redact_performance_entry,
+    summarize_performance_log,
+)
+
 load_dotenv()
 
 DEFAULT_TIMEOUT: Final[int] = 10
-BASE_URL: Final[str] = 'https://administration-etrangers-en-france.interieur.gouv.fr'
+
+# Concurrent sessions must not download chromedriver to the same path at the same time
+_CHROMEDRIVER_INSTALL_LOCK: Final[threading.Lock] = threading.Lock()
 
 
 class ANEFCredentials(BaseModel):
@@ -49,7 +72,11 @@ class ANEFStatusChecker(BaseModel):
     """Handles checking naturalization application status on the ANEF website."""
 
     credentials: ANEFCredentials
+    trace_dir: Optional[Path] = None
     _driver: Optional[WebDriver] = None
+    _wait_seconds: float = 0.0
+    _phase_seconds: Dict[str, float] = PrivateAttr(default_factory=dict)
+    _trace_entries: List[Dict[str, Any]] = PrivateAttr(default_factory=list)
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -63,10 +90,19 @@ class ANEFStatusChecker(BaseModel):
 
     def _setup_webdriver(self) -> WebDriver:
         """Initialize and configure Chrome WebDriver."""
-        chromedriver_autoinstaller.install()  # Automatically installs chromedriver if needed
+        with _CHROMEDRIVER_INSTALL_LOCK:
+            chromedriver_autoinstaller.install()  # Automatically installs chromedriver if needed
         options = webdriver.ChromeOptions()
         if os.getenv('SELENIUM_HEADLESS', 'true').lower() == 'true':
             options.add_argument('--headless')
+        if proxy_server := os.getenv('ANEF_ASSET_PROXY'):
+            options.add_argument(f'--proxy-server={proxy_server}')
+            if proxy_spki := os.getenv('ANEF_ASSET_PROXY_SPKI'):
+                # Trust the proxy's TLS certificate only, instead of ignoring all certificate errors
+                options.add_argument(f'--ignore-certificate-errors-spki-list={proxy_spki}')
+        if self.trace_dir:
+            # Record DevTools network events in the WebDriver performance log
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
         return webdriver.Chrome(options=options)
 
     @property
@@ -78,7 +114,13 @@ class ANEFStatusChecker(BaseModel):
 
     def _wait_for_element(self, by: str, value: str, timeout: int = DEFAULT_TIMEOUT) -> WebElement:
         """Wait for an element to be present on the page."""
-        return WebDriverWait(self.driver, timeout).until(expected_conditions.presence_of_element_located((by, value)))
+        start = time.perf_counter()
+        try:
+            return WebDriverWait(self.driver, timeout).until(
+                expected_conditions.presence_of_element_located((by, value)),
+            )
+        finally:
+            self._wait_seconds += time.perf_counter() - start
 
     def _inject_status_interceptor(self) -> None:
         """Inject JavaScript to intercept the application status response."""
@@ -130,12 +172,47 @@ class ANEFStatusChecker(BaseModel):
 
     def get_application_status(self) -> Dict[str, Any]:
         """Retrieve the naturalization application status."""
-        WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
-            lambda d: d.execute_script("return typeof window.myDossier !== 'undefined';"),  # type: ignore[no-untyped-call]
-        )
+        start = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
+                lambda d: d.execute_script("return typeof window.myDossier !== 'undefined';"),  # type: ignore[no-untyped-call]
+            )
+        finally:
+            self._wait_seconds += time.perf_counter() - start
         dossier: Dict[str, Any] = self.driver.execute_script('return window.myDossier;')  # type: ignore[no-untyped-call]
         return dossier
 
+    @contextmanager
+    def trace_phase(self, phase: str) -> Iterator[None]:
+        """Time a phase of the check and, when tracing, collect its performance log."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phase_seconds[phase] = time.perf_counter() - start
+            if self.trace_dir and self._driver:
+                try:
+                    entries = self._driver.get_log('performance')  # type: ignore[no-untyped-call]
+                except WebDriverException as e:
+                    logger.warning(f'Could not collect the performance log of {phase}: {e}')
+                else:
+                    self._trace_entries.extend(
+                        {**redact_performance_entry(entry), 'phase': phase} for entry in entries
+                    )
+
+    def write_trace(self) -> Optional[TraceSummary]:
+        """Write the raw trace and its summary to ``trace_dir`` and log the summary."""
+        if not self.trace_dir:
+            return None
+        summary = summarize_performance_log(self._trace_entries, self._wait_seconds, self._phase_seconds)
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        stem = f'{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}'  # noqa: DTZ005
+        with (self.trace_dir / f'{stem}-performance.jsonl').open('w', encoding='utf-8') as f:
+            f.writelines(json.dumps(entry) + '\n' for entry in self._trace_entries)
+        (self.trace_dir / f'{stem}-summary.json').write_text(summary.model_dump_json(indent=2), encoding='utf-8')
+        logger.info(f'Trace written to {self.trace_dir / stem}-*\n{format_trace_summary(summary)}')
+        return summary
+
     def cleanup(self) -> None:
         """Close the browser and cleanup resources."""
         if self._driver:
@@ -144,19 +221,27 @@ class ANEFStatusChecker(BaseModel):
             self._driver = None
 
 
-def check_naturalization_status(credentials: ANEFCredentials) -> Dict[str, Any]:
-    """Check naturalization application status using provided credentials."""
+def check_naturalization_status(credentials: ANEFCredentials, trace_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Check naturalization application status using provided credentials.
+
+    When ``trace_dir`` is given, a performance trace of the check is written there.
+    """
     if not credentials:
         raise RuntimeError(
             'Missing required credentials',
         )
-    with ANEFStatusChecker(credentials=credentials) as checker:
+    with ANEFStatusChecker(credentials=credentials, trace_dir=trace_dir) as checker:
         try:
-            checker.login()
-            checker.navigate_to_status_page()
-            application_status = checker.get_application_status()
+            with checker.trace_phase('login'):
+                checker.login()
+            with checker.trace_phase('navigate_to_status_page'):
+                checker.navigate_to_status_page()
+            with checker.trace_phase('get_application_status'):
+                application_status = checker.get_application_status()
             logger.debug(application_status)
             return application_status
         except TimeoutException:
             logger.error('Timeout occurred while checking naturalization status. Please checks your credentials.')
             return {}
+        finally:
+            checker.write_trace()
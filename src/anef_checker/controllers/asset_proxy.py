@@ -0,0 +1,691 @@
+"""Embedded caching forward proxy for ANEF static assets.
+
+Every Chrome started by the checker begins with an empty cache, so each check
+downloads the same Angular bundles, fonts and images again. Routing the browsers
+through this proxy keeps those assets in a shared memory and disk cache, both LRU
+and bounded in bytes. Cached assets are served while fresh according to their
+``Cache-Control``/``Expires`` headers, then revalidated upstream with their
+``ETag``/``Last-Modified`` validators. API and authentication traffic is always
+forwarded uncached.
+
+The ANEF website is served over HTTPS, which a forward proxy only sees as an
+opaque ``CONNECT`` tunnel. To cache it the proxy must terminate TLS for the ANEF
+host, using a certificate and key supplied by the user. Chrome is told to trust
+that certificate only through its SPKI pin (``ANEF_ASSET_PROXY_SPKI``), while the
+proxy itself verifies the real upstream certificate. Without a certificate the
+proxy tunnels HTTPS untouched and only caches plain HTTP.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import select
+import socket
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+from loguru import logger
+from pydantic import (
+    BaseModel,
+    computed_field,
+)
+
+from anef_checker.constants.anef_constants import BASE_URL
+
+DEFAULT_MAX_MEMORY_BYTES: Final[int] = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES: Final[int] = 512 * 1024 * 1024
+UPSTREAM_TIMEOUT: Final[int] = 30
+TUNNEL_BUFFER_SIZE: Final[int] = 64 * 1024
+
+CACHEABLE_EXTENSIONS: Final[frozenset[str]] = frozenset(
+    {
+        '.css',
+        '.eot',
+        '.gif',
+        '.ico',
+        '.jpeg',
+        '.jpg',
+        '.js',
+        '.otf',
+        '.png',
+        '.svg',
+        '.ttf',
+        '.webp',
+        '.woff',
+        '.woff2',
+    },
+)
+UNCACHEABLE_PATH_MARKERS: Final[Tuple[str, ...]] = ('/api/', '/auth', '/login', '/oauth', '/connexion', '/sso')
+HOP_BY_HOP_HEADERS: Final[frozenset[str]] = frozenset(
+    {
+        'connection',
+        'keep-alive',
+        'proxy-authenticate',
+        'proxy-authorization',
+        'proxy-connection',
+        'te',
+        'trailer',
+        'transfer-encoding',
+        'upgrade',
+    },
+)
+CONDITIONAL_HEADERS: Final[frozenset[str]] = frozenset({'if-modified-since', 'if-none-match', 'range'})
+
+
+class AssetCacheStats(BaseModel):
+    """Counters describing how effective the asset cache is."""
+
+    hits: int = 0
+    misses: int = 0
+    passthrough: int = 0
+    revalidated: int = 0
+    bytes_saved: int = 0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def hit_ratio(self) -> float:
+        """Share of cacheable requests that were served from the cache."""
+        cacheable = self.hits + self.misses
+        return self.hits / cacheable if cacheable else 0.0
+
+
+def _get_header(headers: Iterable[Tuple[str, str]], name: str) -> Optional[str]:
+    """Return the first value of header ``name``, compared case-insensitively."""
+    name = name.lower()
+    return next((value for header, value in headers if header.lower() == name), None)
+
+
+def _parse_cache_control(headers: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """Return the ``Cache-Control`` directives as ``{name: value}``, with empty values for flags."""
+    directives = {}
+    for header, value in headers:
+        if header.lower() != 'cache-control':
+            continue
+        for directive in value.split(','):
+            name, _, argument = directive.strip().partition('=')
+            if name:
+                directives[name.lower()] = argument.strip('"')
+    return directives
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    """Convert an HTTP date to a timestamp, or None if it is missing or invalid."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Iterable[Tuple[str, str]], now: float) -> float:
+    """Return how many more seconds a response received at ``now`` may be served without revalidation.
+
+    Follows ``Cache-Control: s-maxage``/``max-age`` minus ``Age``, then ``Expires`` relative to ``Date``;
+    ``no-cache`` and responses without explicit freshness must always be revalidated.
+    """
+    headers = list(headers)
+    directives = _parse_cache_control(headers)
+    if 'no-cache' in directives:
+        return 0.0
+    for directive in ('s-maxage', 'max-age'):
+        if directive in directives:
+            try:
+                max_age = int(directives[directive])
+                age = int(_get_header(headers, 'Age') or 0)
+            except ValueError:
+                return 0.0
+            return max(0.0, float(max_age - age))
+    expires = _parse_http_date(_get_header(headers, 'Expires'))
+    if expires is None:
+        return 0.0
+    date = _parse_http_date(_get_header(headers, 'Date')) or now
+    return max(0.0, expires - date)
+
+
+class CachedAsset(BaseModel):
+    """A cached upstream response and the time until which it may be served without revalidation."""
+
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    expires_at: float = 0.0
+
+    def is_fresh(self, now: float) -> bool:
+        """Return True if the asset may be served without asking the upstream server."""
+        return now < self.expires_at
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers that revalidate this asset upstream."""
+        validators = {}
+        if etag := _get_header(self.headers, 'ETag'):
+            validators['If-None-Match'] = etag
+        if last_modified := _get_header(self.headers, 'Last-Modified'):
+            validators['If-Modified-Since'] = last_modified
+        return validators
+
+    def refreshed(self, headers: Iterable[Tuple[str, str]], now: float) -> CachedAsset:
+        """Return the asset updated with the headers of a ``304 Not Modified`` response received at ``now``."""
+        updates = {name.lower(): (name, value) for name, value in headers if name.lower() != 'content-length'}
+        merged = [updates.pop(name.lower(), (name, value)) for name, value in self.headers]
+        merged.extend(updates.values())
+        return CachedAsset(
+            status=self.status,
+            headers=merged,
+            body=self.body,
+            expires_at=now + freshness_lifetime(merged, now),
+        )
+
+
+def is_cacheable_request(method: str, url: str) -> bool:
+    """Return True if the request targets an immutable static asset of the ANEF website."""
+    if method != 'GET':
+        return False
+    path = urlsplit(url).path.lower()
+    if any(marker in path for marker in UNCACHEABLE_PATH_MARKERS):
+        return False
+    return Path(path).suffix in CACHEABLE_EXTENSIONS
+
+
+def is_cacheable_response(status: int, headers: Iterable[Tuple[str, str]], now: float) -> bool:
+    """Return True if the upstream response may be shared between browser sessions.
+
+    The response must be fresh for a while or carry a validator, otherwise it could never be reused.
+    """
+    if status != 200:  # noqa: PLR2004
+        return False
+    headers = list(headers)
+    if _get_header(headers, 'Set-Cookie') is not None:
+        return False
+    directives = _parse_cache_control(headers)
+    if 'no-store' in directives or 'private' in directives:
+        return False
+    has_validator = any(_get_header(headers, name) for name in ('ETag', 'Last-Modified'))
+    return has_validator or freshness_lifetime(headers, now) > 0
+
+
+class AssetCache:
+    """Thread-safe asset cache with an LRU memory tier and an optional LRU disk tier, both bounded in bytes."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create the cache, storing assets under ``cache_dir`` when given."""
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.clock = clock
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self._entries: OrderedDict[str, CachedAsset] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.disk_bytes = sum(path.stat().st_size for path in self.cache_dir.glob('*.bin'))
+            self._evict_from_disk()
+
+    @staticmethod
+    def make_key(url: str, accept_encoding: str = '') -> str:
+        """Build the cache key; the encoding is part of it because bodies are stored compressed."""
+        return hashlib.sha256(f'{url}\n{accept_encoding}'.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedAsset]:
+        """Return the cached asset for ``key``, promoting disk hits to memory."""
+        with self._lock:
+            asset = self._entries.get(key)
+            if asset:
+                self._entries.move_to_end(key)
+                return asset
+        asset = self._read_from_disk(key)
+        if asset:
+            self._store_in_memory(key, asset)
+        return asset
+
+    def put(self, key: str, asset: CachedAsset) -> None:
+        """Store an asset in memory and on disk."""
+        self._store_in_memory(key, asset)
+        self._write_to_disk(key, asset)
+
+    def _store_in_memory(self, key: str, asset: CachedAsset) -> None:
+        """Insert an asset in the memory tier and evict least recently used entries over budget."""
+        size = len(asset.body)
+        if size > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self.memory_bytes -= len(previous.body)
+            self._entries[key] = asset
+            self.memory_bytes += size
+            while self.memory_bytes > self.max_memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.memory_bytes -= len(evicted.body)
+
+    def _read_from_disk(self, key: str) -> Optional[CachedAsset]:
+        """Load an asset from the disk tier, if present, and mark it as recently used."""
+        if not self.cache_dir:
+            return None
+        meta_path = self.cache_dir / f'{key}.json'
+        body_path = self.cache_dir / f'{key}.bin'
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            asset = CachedAsset(
+                status=meta['status'],
+                headers=meta['headers'],
+                body=body_path.read_bytes(),
+                expires_at=meta.get('expires_at', 0.0),
+            )
+            os.utime(body_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return asset
+
+    def _write_to_disk(self, key: str, asset: CachedAsset) -> None:
+        """Persist an asset to the disk tier, writing the body before its metadata."""
+        if not self.cache_dir or len(asset.body) > self.max_disk_bytes:
+            return
+        body_path = self.cache_dir / f'{key}.bin'
+        with self._disk_lock:
+            try:
+                previous_size = body_path.stat().st_size if body_path.exists() else 0
+                body_path.write_bytes(asset.body)
+                (self.cache_dir / f'{key}.json').write_text(
+                    json.dumps({'status': asset.status, 'headers': asset.headers, 'expires_at': asset.expires_at}),
+                    encoding='utf-8',
+                )
+            except OSError as e:
+                logger.warning(f'Could not write asset to disk cache: {e}')
+                return
+            self.disk_bytes += len(asset.body) - previous_size
+        self._evict_from_disk()
+
+    def _evict_from_disk(self) -> None:
+        """Delete the least recently used assets from the disk tier until it fits its budget."""
+        if not self.cache_dir:
+            return
+        with self._disk_lock:
+            if self.disk_bytes <= self.max_disk_bytes:
+                return
+            bodies = []
+            for path in self.cache_dir.glob('*.bin'):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                bodies.append((stat.st_mtime, stat.st_size, path))
+            for _, size, path in sorted(bodies, key=lambda body: body[0]):
+                if self.disk_bytes <= self.max_disk_bytes:
+                    break
+                path.with_suffix('.json').unlink(missing_ok=True)
+                path.unlink(missing_ok=True)
+                self.disk_bytes -= size
+
+
+class _ProxyServer(ThreadingHTTPServer):
+    """HTTP server holding the state shared by all proxy request handlers."""
+
+    daemon_threads = True
+
+    def __init__(self, proxy: AssetCacheProxy) -> None:
+        self.proxy = proxy
+        super().__init__((proxy.host, proxy.port), _ProxyRequestHandler)
+
+
+class _ProxyRequestHandler(BaseHTTPRequestHandler):
+    """Forward, cache or tunnel a single browser request."""
+
+    server: _ProxyServer
+    protocol_version = 'HTTP/1.1'
+    tls_host: Optional[str] = None
+    # Kept open across the requests of the browser connection, like the browser's own keep-alive connection
+    _upstream: Optional[http.client.HTTPConnection] = None
+    _upstream_origin: Optional[Tuple[str, str, Optional[int]]] = None
+
+    def finish(self) -> None:
+        """Close the upstream connection along with the browser connection."""
+        self._close_upstream()
+        super().finish()
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Route the default access log to loguru at debug level."""
+        logger.debug(f'asset proxy: {format % args}')
+
+    def do_CONNECT(self) -> None:  # noqa: N802
+        """Open an HTTPS tunnel, terminating TLS for intercepted hosts."""
+        host, _, port = self.path.partition(':')
+        proxy = self.server.proxy
+        if proxy.tls_context and host in proxy.intercept_hosts:
+            self.send_response(200, 'Connection Established')
+            self.end_headers()
+            self._intercept_tls(host if port in ('', '443') else self.path)
+        else:
+            proxy.record(passthrough=True)
+            self._tunnel(host, int(port or 443))
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Forward a GET request, serving static assets from the cache."""
+        self._forward()
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        """Forward a HEAD request."""
+        self._forward()
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Forward a POST request."""
+        self._forward()
+
+    def do_PUT(self) -> None:  # noqa: N802
+        """Forward a PUT request."""
+        self._forward()
+
+    def do_PATCH(self) -> None:  # noqa: N802
+        """Forward a PATCH request."""
+        self._forward()
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        """Forward a DELETE request."""
+        self._forward()
+
+    def do_OPTIONS(self) -> None:  # noqa: N802
+        """Forward a OPTIONS request."""
+        self._forward()
+
+    def _intercept_tls(self, host: str) -> None:
+        """Serve the browser's requests from inside the TLS tunnel."""
+        proxy = self.server.proxy
+        try:
+            self.connection = proxy.tls_context.wrap_socket(  # type: ignore[union-attr]
+                self.connection,
+                server_side=True,
+            )
+        except (ssl.SSLError, OSError) as e:
+            logger.warning(f'asset proxy: TLS handshake with browser failed: {e}')
+            self.close_connection = True
+            return
+        self.rfile = self.connection.makefile('rb', self.rbufsize)
+        self.wfile = self.connection.makefile('wb', self.wbufsize)
+        self.tls_host = host
+        self.close_connection = False
+        while not self.close_connection:
+            self.handle_one_request()
+
+    def _tunnel(self, host: str, port: int) -> None:
+        """Relay raw bytes between the browser and the upstream host."""
+        try:
+            upstream = socket.create_connection((host, port), timeout=UPSTREAM_TIMEOUT)
+        except OSError as e:
+            self.send_error(502, f'Cannot reach {host}:{port}: {e}')
+            return
+        self.send_response(200, 'Connection Established')
+        self.end_headers()
+        with upstream:
+            sockets = [self.connection, upstream]
+            while True:
+                readable, _, errored = select.select(sockets, [], sockets, UPSTREAM_TIMEOUT)
+                if errored or not readable:
+                    break
+                for sock in readable:
+                    data = sock.recv(TUNNEL_BUFFER_SIZE)
+                    if not data:
+                        self.close_connection = True
+                        return
+                    (upstream if sock is self.connection else self.connection).sendall(data)
+        self.close_connection = True
+
+    def _request_url(self) -> str:
+        """Return the absolute URL of the current request."""
+        if self.tls_host:
+            return f'https://{self.tls_host}{self.path}'
+        return self.path
+
+    def _forward(self) -> None:
+        """Serve the request from the cache, revalidating stale assets, or forward it upstream."""
+        proxy = self.server.proxy
+        cache = proxy.cache
+        url = self._request_url()
+        cacheable = is_cacheable_request(self.command, url)
+        key = cache.make_key(url, self.headers.get('Accept-Encoding', '')) if cacheable else ''
+        cached = cache.get(key) if cacheable else None
+
+        if cached and cached.is_fresh(cache.clock()):
+            proxy.record(hit=True, saved=len(cached.body))
+            self._send(cached)
+            return
+
+        try:
+            asset = self._fetch_upstream(
+                url,
+                drop_conditionals=cacheable,
+                validators=cached.validators if cached else None,
+            )
+        except (OSError, http.client.HTTPException) as e:
+            self.send_error(502, f'Upstream request failed: {e}')
+            return
+
+        now = cache.clock()
+        if cached and asset.status == 304:  # noqa: PLR2004
+            refreshed = cached.refreshed(asset.headers, now)
+            cache.put(key, refreshed)
+            proxy.record(hit=True, revalidated=True, saved=len(cached.body))
+            self._send(refreshed)
+            return
+
+        if cacheable and is_cacheable_response(asset.status, asset.headers, now):
+            asset.expires_at = now + freshness_lifetime(asset.headers, now)
+            cache.put(key, asset)
+            proxy.record(miss=True)
+        else:
+            proxy.record(passthrough=True)
+        self._send(asset)
+
+    def _fetch_upstream(
+        self,
+        url: str,
+        *,
+        drop_conditionals: bool,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> CachedAsset:
+        """Perform the request against the real server and read the full response.
+
+        The browser's conditional headers are dropped for cacheable requests, so that the cache stores full
+        responses; ``validators`` then revalidates the cached copy instead.
+        """
+        parts = urlsplit(url)
+        skipped = HOP_BY_HOP_HEADERS | (CONDITIONAL_HEADERS if drop_conditionals else frozenset())
+        headers = {name: value for name, value in self.headers.items() if name.lower() not in skipped}
+        headers.update(validators or {})
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else None
+        target = parts.path or '/'
+        if parts.query:
+            target = f'{target}?{parts.query}'
+
+        reused = self._upstream is not None and self._upstream_origin == (parts.scheme, parts.hostname, parts.port)
+        try:
+            response = self._request_upstream(parts.scheme, parts.hostname or '', parts.port, target, body, headers)
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            if not reused:
+                raise
+            # The server closed the idle keep-alive connection: retry once on a new one
+            response = self._request_upstream(parts.scheme, parts.hostname or '', parts.port, target, body, headers)
+        try:
+            return CachedAsset(
+                status=response.status,
+                headers=[(n, v) for n, v in response.getheaders() if n.lower() not in HOP_BY_HOP_HEADERS],
+                body=response.read(),
+            )
+        finally:
+            if response.will_close:
+                self._close_upstream()
+
+    def _request_upstream(  # noqa: PLR0913, PLR0917
+        self,
+        scheme: str,
+        host: str,
+        port: Optional[int],
+        target: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+    ) -> http.client.HTTPResponse:
+        """Send a request on the upstream connection of this handler, opening it if needed."""
+        if self._upstream is None or self._upstream_origin != (scheme, host, port):
+            self._close_upstream()
+            if scheme == 'https':
+                self._upstream = http.client.HTTPSConnection(
+                    host,
+                    port,
+                    timeout=UPSTREAM_TIMEOUT,
+                    context=self.server.proxy.upstream_tls_context,
+                )
+            else:
+                self._upstream = http.client.HTTPConnection(host, port, timeout=UPSTREAM_TIMEOUT)
+            self._upstream_origin = (scheme, host, port)
+        try:
+            self._upstream.request(self.command, target, body=body, headers=headers)
+            return self._upstream.getresponse()
+        except (OSError, http.client.HTTPException):
+            self._close_upstream()
+            raise
+
+    def _close_upstream(self) -> None:
+        """Close the upstream connection of this handler, if any."""
+        if self._upstream is not None:
+            self._upstream.close()
+        self._upstream = None
+        self._upstream_origin = None
+
+    def _send(self, asset: CachedAsset) -> None:
+        """Write a response back to the browser.
+
+        Responses without a body (HEAD, 304) keep the upstream ``Content-Length``, which describes the full resource.
+        """
+        has_body = self.command != 'HEAD' and asset.status not in (204, 304)
+        self.send_response(asset.status)
+        for name, value in asset.headers:
+            if has_body and name.lower() == 'content-length':
+                continue
+            self.send_header(name, value)
+        if has_body:
+            self.send_header('Content-Length', str(len(asset.body)))
+        self.end_headers()
+        if has_body:
+            self.wfile.write(asset.body)
+
+
+class AssetCacheProxy:
+    """Caching forward proxy shared by all checker browsers.
+
+    Use it as a context manager and point Chrome at :attr:`url`, for example by
+    exporting it as ``ANEF_ASSET_PROXY`` before starting the checkers.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        cache_dir: Optional[Path] = None,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+        tls_cert_file: Optional[Path] = None,
+        tls_key_file: Optional[Path] = None,
+        intercept_hosts: Iterable[str] = (urlsplit(BASE_URL).hostname or '',),
+    ) -> None:
+        """Configure the proxy; ``port=0`` picks a free port when started."""
+        self.host = host
+        self.port = port
+        self.cache = AssetCache(cache_dir=cache_dir, max_memory_bytes=max_memory_bytes, max_disk_bytes=max_disk_bytes)
+        self.intercept_hosts = frozenset(intercept_hosts)
+        self.tls_context: Optional[ssl.SSLContext] = None
+        # Loading the CA store is slow: share one client context between all upstream connections
+        self.upstream_tls_context = ssl.create_default_context()
+        if tls_cert_file and tls_key_file:
+            self.tls_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.tls_context.load_cert_chain(certfile=tls_cert_file, keyfile=tls_key_file)
+        self._stats = AssetCacheStats()
+        self._stats_lock = threading.Lock()
+        self._server: Optional[_ProxyServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> AssetCacheProxy:
+        """Start the proxy and return it for use in a with statement."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # type: ignore[no-untyped-def] # noqa: ANN001
+        """Stop the proxy when exiting the with statement."""
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """Proxy address to pass to Chrome's ``--proxy-server``."""
+        return f'http://{self.host}:{self.port}'
+
+    @property
+    def stats(self) -> AssetCacheStats:
+        """Snapshot of the cache counters."""
+        with self._stats_lock:
+            return self._stats.model_copy()
+
+    def record(  # noqa: PLR0913
+        self,
+        *,
+        hit: bool = False,
+        miss: bool = False,
+        passthrough: bool = False,
+        revalidated: bool = False,
+        saved: int = 0,
+    ) -> None:
+        """Update the cache counters."""
+        with self._stats_lock:
+            self._stats.hits += hit
+            self._stats.misses += miss
+            self._stats.passthrough += passthrough
+            self._stats.revalidated += revalidated
+            self._stats.bytes_saved += saved
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        if self._server:
+            return
+        self._server = _ProxyServer(self)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='asset-proxy', daemon=True)
+        self._thread.start()
+        logger.info(f'Asset proxy listening on {self.url} (TLS interception: {bool(self.tls_context)})')
+
+    def stop(self) -> None:
+        """Stop serving and log the final cache counters."""
+        if not self._server:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+        logger.info(f'Asset proxy stopped: {self.stats.model_dump()}')
@@ -0,0 +1,251 @@
+"""Host-aware sizing of the number of concurrent browser sessions.
+
+The :class:`CapacityController` measures available memory, CPU count and load,
+and the resident memory of the Chrome processes started by the checkers. From
+these it derives how many ``ANEFStatusChecker`` sessions the host can run at
+once, within the configured bounds, and holds back new sessions under memory
+pressure. Each change of the target is logged so hosts can be sized from it.
+
+Sessions that are still warming up (started recently, or whose Chrome is not
+running yet) have not used their memory yet: they are charged the estimated
+per-session RSS against the available memory, and the per-session estimate is
+only sampled when every session has a settled browser.
+
+Memory and process measurements read ``/proc`` and are only available on Linux;
+elsewhere the controller falls back to the CPU bound and the default per-session
+memory estimate.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Final,
+    List,
+    Optional,
+)
+
+from loguru import logger
+from pydantic import BaseModel
+
+MIB: Final[int] = 1024 * 1024
+DEFAULT_SESSION_RSS_BYTES: Final[int] = 400 * MIB
+DEFAULT_MEMORY_RESERVE_BYTES: Final[int] = 512 * MIB
+DEFAULT_SESSIONS_PER_CPU: Final[float] = 1.0
+RSS_SMOOTHING: Final[float] = 0.3
+DEFAULT_SESSION_WARMUP_SECONDS: Final[float] = 15.0
+BROWSER_PROCESS_NAMES: Final[tuple[str, ...]] = ('chrome', 'chromium', 'chromedriver')
+DRIVER_PROCESS_NAME: Final[str] = 'chromedriver'
+PROC_PATH: Final[Path] = Path('/proc')
+
+
+class HostResources(BaseModel):
+    """Snapshot of the host resources relevant to browser sessions."""
+
+    cpu_count: int
+    total_memory_bytes: Optional[int] = None
+    available_memory_bytes: Optional[int] = None
+    load_average: Optional[float] = None
+
+
+def read_host_resources() -> HostResources:
+    """Measure the CPU count, memory and one-minute load average of the host."""
+    total_memory = available_memory = None
+    try:
+        meminfo = (PROC_PATH / 'meminfo').read_text(encoding='utf-8')
+        fields = {line.split(':')[0]: int(line.split()[1]) * 1024 for line in meminfo.splitlines() if line.strip()}
+        total_memory = fields.get('MemTotal')
+        available_memory = fields.get('MemAvailable')
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        load_average: Optional[float] = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        load_average = None
+
+    return HostResources(
+        cpu_count=os.cpu_count() or 1,
+        total_memory_bytes=total_memory,
+        available_memory_bytes=available_memory,
+        load_average=load_average,
+    )
+
+
+def _read_process_table() -> Dict[int, tuple[int, str, int]]:
+    """Return ``{pid: (parent pid, name, rss bytes)}`` for all processes visible in ``/proc``."""
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    processes = {}
+    for entry in PROC_PATH.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / 'stat').read_text(encoding='utf-8')
+            rss_pages = int((entry / 'statm').read_text(encoding='utf-8').split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        # The process name is wrapped in parentheses and may contain spaces
+        name = stat[stat.index('(') + 1 : stat.rindex(')')]
+        parent_pid = int(stat[stat.rindex(')') + 2 :].split()[1])
+        processes[int(entry.name)] = (parent_pid, name, rss_pages * page_size)
+    return processes
+
+
+class BrowserUsage(BaseModel):
+    """Browsers running under a process and the memory they use."""
+
+    rss_bytes: int
+    running_browsers: int
+
+
+def measure_browsers(root_pid: Optional[int] = None) -> Optional[BrowserUsage]:
+    """Measure the Chrome and chromedriver processes descending from ``root_pid``.
+
+    Defaults to the current process, which started the browsers through ``_setup_webdriver``. A browser is
+    counted as running once its chromedriver has started Chrome. Returns None when the process table cannot be read.
+    """
+    if not PROC_PATH.is_dir():
+        return None
+    try:
+        processes = _read_process_table()
+    except OSError:
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for pid, (parent_pid, _, _) in processes.items():
+        children.setdefault(parent_pid, []).append(pid)
+
+    total = running = 0
+    pending = list(children.get(root_pid or os.getpid(), []))
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        _, name, rss = processes[pid]
+        name = name.lower()
+        if any(browser in name for browser in BROWSER_PROCESS_NAMES):
+            total += rss
+        if name == DRIVER_PROCESS_NAME and children.get(pid):
+            running += 1
+    return BrowserUsage(rss_bytes=total, running_browsers=running)
+
+
+class CapacityController:
+    """Decide how many browser sessions may run concurrently on this host."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        min_sessions: int = 1,
+        max_sessions: int = 4,
+        memory_reserve_bytes: int = DEFAULT_MEMORY_RESERVE_BYTES,
+        sessions_per_cpu: float = DEFAULT_SESSIONS_PER_CPU,
+        default_session_rss_bytes: int = DEFAULT_SESSION_RSS_BYTES,
+        *,
+        session_warmup_seconds: float = DEFAULT_SESSION_WARMUP_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Configure the session bounds and the memory kept free for the rest of the host."""
+        if not 1 <= min_sessions <= max_sessions:
+            raise ValueError('Session bounds must satisfy 1 <= min_sessions <= max_sessions')
+        self.min_sessions = min_sessions
+        self.max_sessions = max_sessions
+        self.memory_reserve_bytes = memory_reserve_bytes
+        self.sessions_per_cpu = sessions_per_cpu
+        self.session_rss_bytes = float(default_session_rss_bytes)
+        self.session_warmup_seconds = session_warmup_seconds
+        self.clock = clock
+        self.target_sessions = min_sessions
+        self.resources = read_host_resources()
+        self.running_browsers: Optional[int] = None
+        self._session_starts: Deque[float] = deque()
+        self._holding_back = False
+
+    def session_started(self) -> None:
+        """Record that a session was just started; it is treated as warming up for ``session_warmup_seconds``."""
+        self._session_starts.append(self.clock())
+
+    def warming_sessions(self, active_sessions: int) -> int:
+        """Return how many active sessions have not yet reached their full memory use."""
+        horizon = self.clock() - self.session_warmup_seconds
+        while self._session_starts and self._session_starts[0] < horizon:
+            self._session_starts.popleft()
+        without_browser = active_sessions - self.running_browsers if self.running_browsers is not None else 0
+        return max(0, min(active_sessions, max(len(self._session_starts), without_browser)))
+
+    def observe(self, active_sessions: int) -> None:
+        """Refresh the host measurements and, once all sessions are settled, the smoothed per-session browser RSS."""
+        self.resources = read_host_resources()
+        usage = measure_browsers()
+        self.running_browsers = usage.running_browsers if usage else None
+        if active_sessions <= 0 or not usage or not usage.rss_bytes:
+            return
+        if self.warming_sessions(active_sessions):
+            # Browsers still starting would drag the estimate down
+            return
+        sample = usage.rss_bytes / active_sessions
+        self.session_rss_bytes += RSS_SMOOTHING * (sample - self.session_rss_bytes)
+
+    def _memory_headroom(self, active_sessions: int) -> Optional[float]:
+        """Return the memory that new sessions may use, or None if it cannot be measured.
+
+        Warming sessions are charged a full session, since most of their memory is not in use yet.
+        """
+        if self.resources.available_memory_bytes is None:
+            return None
+        warming_reserve = self.warming_sessions(active_sessions) * self.session_rss_bytes
+        return self.resources.available_memory_bytes - self.memory_reserve_bytes - warming_reserve
+
+    def update_target(self, active_sessions: int) -> int:
+        """Recompute the number of sessions the host can sustain and log any change."""
+        cpu_bound = max(1, int(self.resources.cpu_count * self.sessions_per_cpu))
+        load = self.resources.load_average
+        if load is not None and load > self.resources.cpu_count:
+            # The host is already saturated: shrink below the current concurrency
+            cpu_bound = min(cpu_bound, max(active_sessions - 1, 1))
+
+        headroom = self._memory_headroom(active_sessions)
+        memory_bound = self.max_sessions
+        if headroom is not None:
+            memory_bound = active_sessions + int(headroom // self.session_rss_bytes)
+
+        target = max(self.min_sessions, min(self.max_sessions, cpu_bound, memory_bound))
+        if target != self.target_sessions:
+            logger.info(
+                f'Capacity: target sessions {self.target_sessions} -> {target} '
+                f'(active={active_sessions}, cpu bound={cpu_bound}, memory bound={memory_bound}, '
+                f'session RSS={self.session_rss_bytes / MIB:.0f} MiB, '
+                f'available memory={self._format_mib(self.resources.available_memory_bytes)}, '
+                f'warming sessions={self.warming_sessions(active_sessions)}, '
+                f'load={load if load is not None else "n/a"}, cpus={self.resources.cpu_count})',
+            )
+            self.target_sessions = target
+        return target
+
+    def can_start_session(self, active_sessions: int) -> bool:
+        """Return True if one more session may be started now."""
+        self.observe(active_sessions)
+        target = self.update_target(active_sessions)
+        if active_sessions < self.min_sessions:
+            return True
+        if active_sessions >= target:
+            return False
+        headroom = self._memory_headroom(active_sessions)
+        holding_back = headroom is not None and headroom < self.session_rss_bytes
+        if holding_back and not self._holding_back:
+            logger.info(
+                f'Capacity: holding back new sessions under memory pressure '
+                f'(available={self._format_mib(self.resources.available_memory_bytes)}, '
+                f'session RSS={self.session_rss_bytes / MIB:.0f} MiB)',
+            )
+        self._holding_back = holding_back
+        return not holding_back
+
+    @staticmethod
+    def _format_mib(value: Optional[int]) -> str:
+        """Format a byte count in MiB for the capacity logs."""
+        return f'{value / MIB:.0f} MiB' if value is not None else 'n/a'
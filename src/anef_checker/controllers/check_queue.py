@@ -0,0 +1,425 @@
+"""Distributed queue of status check jobs.
+
+A coordinator enqueues account checks and ``anef_checker worker`` processes,
+possibly on several machines, lease them, run the check and report the result.
+
+- A leased job is invisible to other workers until its lease expires. Workers
+  extend the lease while the check runs, so a job whose worker died is
+  re-delivered once the visibility timeout elapses.
+- A job is only leased when no other job for the same username holds an active
+  lease, so an account is never checked twice at the same time.
+- A job that fails or loses its lease ``max_attempts`` times is marked failed.
+
+Brokers are pluggable and selected by URL scheme through :func:`open_broker`.
+The bundled ``sqlite:///path/to/queue.db`` broker (or a plain file path) is meant
+for a single machine (or for testing); register another backend with
+:func:`register_broker` to share the queue between hosts.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+)
+from urllib.parse import (
+    unquote,
+    urlsplit,
+)
+
+from loguru import logger
+from pydantic import (
+    BaseModel,
+    SecretStr,
+)
+
+if TYPE_CHECKING:
+    from anef_checker.controllers.capacity import CapacityController
+
+from anef_checker.constants.anef_enums import (
+    JobStateEnum,
+    LanguageEnum,
+)
+from anef_checker.controllers.paths import get_cache_dir
+
+DEFAULT_VISIBILITY_TIMEOUT: Final[float] = 300.0
+DEFAULT_MAX_ATTEMPTS: Final[int] = 3
+DEFAULT_POLL_INTERVAL: Final[float] = 2.0
+
+
+class CheckJob(BaseModel):
+    """A status check job and its delivery state."""
+
+    job_id: str
+    username: str
+    password: SecretStr
+    url: Optional[str] = None
+    language: LanguageEnum = LanguageEnum.FR
+    state: JobStateEnum = JobStateEnum.PENDING
+    attempts: int = 0
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    lease_token: Optional[str] = None
+    leased_by: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+    enqueued_at: float
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class CheckBroker(Protocol):
+    """Storage backend of the distributed check queue."""
+
+    def enqueue(  # noqa: D102
+        self,
+        username: str,
+        password: str,
+        url: Optional[str] = None,
+        language: LanguageEnum = LanguageEnum.FR,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> str: ...
+
+    def lease(self, worker_id: str, visibility_timeout: float) -> Optional[CheckJob]:  # noqa: D102
+        ...
+
+    def extend_lease(self, job_id: str, lease_token: str, visibility_timeout: float) -> bool:  # noqa: D102
+        ...
+
+    def complete(self, job_id: str, lease_token: str, result: Dict[str, Any]) -> bool:  # noqa: D102
+        ...
+
+    def fail(self, job_id: str, lease_token: str, error: str) -> bool:  # noqa: D102
+        ...
+
+    def get_job(self, job_id: str) -> Optional[CheckJob]:  # noqa: D102
+        ...
+
+    def list_jobs(self, state: Optional[JobStateEnum] = None) -> List[CheckJob]:  # noqa: D102
+        ...
+
+
+class SQLiteCheckBroker:
+    """Check queue stored in a SQLite database, safe for several processes on one machine."""
+
+    def __init__(self, db_path: Path, clock: Callable[[], float] = time.time) -> None:
+        """Open (and create if needed) the queue database at ``db_path``."""
+        self.db_path = db_path
+        self._clock = clock
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.db_path.exists():
+            # The queue holds account passwords until the check completes
+            self.db_path.touch(mode=0o600)
+        with self._transaction() as db:
+            db.execute(
+                '''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    username TEXT NOT NULL,
+                    password TEXT NOT NULL,
+                    url TEXT,
+                    language TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    lease_token TEXT,
+                    leased_by TEXT,
+                    lease_expires_at REAL,
+                    enqueued_at REAL NOT NULL,
+                    finished_at REAL,
+                    result TEXT,
+                    error TEXT
+                )
+                ''',
+            )
+            db.execute('CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, enqueued_at)')
+
+    @classmethod
+    def from_url(cls, url: str) -> SQLiteCheckBroker:
+        """Create a broker from a ``sqlite:///path/to/queue.db`` URL."""
+        return cls(sqlite_path_from_url(url))
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction that serializes concurrent workers."""
+        db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                yield db
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+            db.execute('COMMIT')
+        finally:
+            db.close()
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> CheckJob:
+        """Convert a database row into a job."""
+        values = dict(row)
+        values['result'] = json.loads(values['result']) if values['result'] else None
+        return CheckJob(**values)
+
+    def enqueue(
+        self,
+        username: str,
+        password: str,
+        url: Optional[str] = None,
+        language: LanguageEnum = LanguageEnum.FR,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> str:
+        """Add a check job to the queue and return its id."""
+        job_id = uuid.uuid4().hex
+        with self._transaction() as db:
+            db.execute(
+                'INSERT INTO jobs (job_id, username, password, url, language, state, max_attempts, enqueued_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    job_id,
+                    username,
+                    password,
+                    url,
+                    language.value,
+                    JobStateEnum.PENDING.value,
+                    max_attempts,
+                    self._clock(),
+                ),
+            )
+        return job_id
+
+    def lease(self, worker_id: str, visibility_timeout: float) -> Optional[CheckJob]:
+        """Lease the oldest deliverable job, skipping usernames that are already being checked."""
+        now = self._clock()
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET state = ?, error = 'Lease expired too many times', password = '', finished_at = ? "
+                'WHERE state = ? AND lease_expires_at <= ? AND attempts >= max_attempts',
+                (JobStateEnum.FAILED.value, now, JobStateEnum.LEASED.value, now),
+            )
+            row = db.execute(
+                '''
+                SELECT job_id FROM jobs
+                WHERE (state = :pending OR (state = :leased AND lease_expires_at <= :now))
+                AND username NOT IN (
+                    SELECT username FROM jobs WHERE state = :leased AND lease_expires_at > :now
+                )
+                ORDER BY enqueued_at, rowid
+                LIMIT 1
+                ''',
+                {'pending': JobStateEnum.PENDING.value, 'leased': JobStateEnum.LEASED.value, 'now': now},
+            ).fetchone()
+            if not row:
+                return None
+            db.execute(
+                'UPDATE jobs SET state = ?, attempts = attempts + 1, lease_token = ?, leased_by = ?, '
+                'lease_expires_at = ? WHERE job_id = ?',
+                (JobStateEnum.LEASED.value, uuid.uuid4().hex, worker_id, now + visibility_timeout, row['job_id']),
+            )
+            return self._to_job(db.execute('SELECT * FROM jobs WHERE job_id = ?', (row['job_id'],)).fetchone())
+
+    def extend_lease(self, job_id: str, lease_token: str, visibility_timeout: float) -> bool:
+        """Push back the lease expiry; returns False if the lease was lost."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                'UPDATE jobs SET lease_expires_at = ? WHERE job_id = ? AND lease_token = ? AND state = ?',
+                (self._clock() + visibility_timeout, job_id, lease_token, JobStateEnum.LEASED.value),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, lease_token: str, result: Dict[str, Any]) -> bool:
+        """Store the result of a leased job; returns False if the lease was lost."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET state = ?, result = ?, password = '', lease_expires_at = NULL, finished_at = ? "
+                'WHERE job_id = ? AND lease_token = ? AND state = ?',
+                (
+                    JobStateEnum.DONE.value,
+                    json.dumps(result),
+                    self._clock(),
+                    job_id,
+                    lease_token,
+                    JobStateEnum.LEASED.value,
+                ),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, lease_token: str, error: str) -> bool:
+        """Record a failed attempt, re-queueing the job while attempts remain."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                '''
+                UPDATE jobs SET
+                    state = CASE WHEN attempts >= max_attempts THEN :failed ELSE :pending END,
+                    password = CASE WHEN attempts >= max_attempts THEN '' ELSE password END,
+                    finished_at = CASE WHEN attempts >= max_attempts THEN :now ELSE NULL END,
+                    error = :error, lease_token = NULL, leased_by = NULL, lease_expires_at = NULL
+                WHERE job_id = :job_id AND lease_token = :lease_token AND state = :leased
+                ''',
+                {
+                    'failed': JobStateEnum.FAILED.value,
+                    'pending': JobStateEnum.PENDING.value,
+                    'leased': JobStateEnum.LEASED.value,
+                    'now': self._clock(),
+                    'error': error,
+                    'job_id': job_id,
+                    'lease_token': lease_token,
+                },
+            )
+            return cursor.rowcount == 1
+
+    def get_job(self, job_id: str) -> Optional[CheckJob]:
+        """Return a job by id."""
+        with self._transaction() as db:
+            row = db.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+            return self._to_job(row) if row else None
+
+    def list_jobs(self, state: Optional[JobStateEnum] = None) -> List[CheckJob]:
+        """Return all jobs, optionally filtered by state, oldest first."""
+        with self._transaction() as db:
+            if state:
+                rows = db.execute('SELECT * FROM jobs WHERE state = ? ORDER BY enqueued_at, rowid', (state.value,))
+            else:
+                rows = db.execute('SELECT * FROM jobs ORDER BY enqueued_at, rowid')
+            return [self._to_job(row) for row in rows.fetchall()]
+
+
+BROKER_BACKENDS: Dict[str, Callable[[str], CheckBroker]] = {
+    'sqlite': SQLiteCheckBroker.from_url,
+}
+
+
+def register_broker(scheme: str, factory: Callable[[str], CheckBroker]) -> None:
+    """Register a broker backend for URLs starting with ``<scheme>://``."""
+    BROKER_BACKENDS[scheme] = factory
+
+
+def sqlite_path_from_url(url: str) -> Path:
+    """Return the database path of a ``sqlite:///`` URL, including Windows paths such as ``sqlite:///C:/queue.db``."""
+    path = unquote(urlsplit(url).path)
+    # The path of sqlite:///C:/... is /C:/..., which is not a valid Windows path
+    if re.match(r'^/[A-Za-z]:', path):
+        path = path[1:]
+    return Path(path)
+
+
+def get_default_broker_url() -> str:
+    """Return the broker URL from ``ANEF_QUEUE_URL`` or a SQLite queue in the cache directory."""
+    return os.getenv('ANEF_QUEUE_URL') or f'sqlite:///{(get_cache_dir() / "queue.db").as_posix()}'
+
+
+def open_broker(url: Optional[str] = None) -> CheckBroker:
+    """Open the broker backend matching the scheme of ``url``; a plain file path opens a SQLite queue."""
+    url = url or get_default_broker_url()
+    if '://' not in url:
+        return SQLiteCheckBroker(Path(url))
+    scheme = urlsplit(url).scheme
+    if scheme not in BROKER_BACKENDS:
+        raise ValueError(f'Unsupported queue backend: {scheme!r}')
+    return BROKER_BACKENDS[scheme](url)
+
+
+def _keep_lease_alive(
+    broker: CheckBroker,
+    job: CheckJob,
+    visibility_timeout: float,
+    done: threading.Event,
+) -> None:
+    """Extend the lease of ``job`` until ``done`` is set or the lease is lost."""
+    while not done.wait(visibility_timeout / 3):
+        if not broker.extend_lease(job.job_id, job.lease_token or '', visibility_timeout):
+            logger.warning(f'Lost the lease of job {job.job_id}')
+            return
+
+
+def process_job(
+    broker: CheckBroker,
+    job: CheckJob,
+    check: Callable[[CheckJob], Dict[str, Any]],
+    visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+) -> None:
+    """Run ``check`` on a leased job while keeping its lease alive, then report the outcome."""
+    done = threading.Event()
+    heartbeat = threading.Thread(
+        target=_keep_lease_alive,
+        args=(broker, job, visibility_timeout, done),
+        name=f'lease-{job.job_id}',
+        daemon=True,
+    )
+    heartbeat.start()
+    try:
+        result = check(job)
+    except Exception as e:  # noqa: BLE001
+        logger.error(f'Job {job.job_id} failed on attempt {job.attempts}: {e}')
+        broker.fail(job.job_id, job.lease_token or '', str(e))
+        return
+    finally:
+        done.set()
+        heartbeat.join()
+
+    if not broker.complete(job.job_id, job.lease_token or '', result):
+        logger.warning(f'Result of job {job.job_id} discarded: the lease expired and the job was re-delivered')
+
+
+def run_worker(  # noqa: PLR0913
+    broker: CheckBroker,
+    check: Callable[[CheckJob], Dict[str, Any]],
+    *,
+    worker_id: Optional[str] = None,
+    visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_jobs: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+    capacity: Optional[CapacityController] = None,
+) -> int:
+    """Lease and process jobs until ``stop`` is set or ``max_jobs`` jobs were processed; returns the job count.
+
+    Jobs are processed one at a time, or concurrently as allowed by ``capacity``.
+    """
+    worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+    stop = stop or threading.Event()
+    sessions: List[threading.Thread] = []
+    started = 0
+    while not stop.is_set() and (max_jobs is None or started < max_jobs):
+        sessions = [session for session in sessions if session.is_alive()]
+        can_start = capacity.can_start_session(len(sessions)) if capacity else not sessions
+        job = broker.lease(worker_id, visibility_timeout) if can_start else None
+        if not job:
+            stop.wait(poll_interval)
+            continue
+        logger.info(f'Worker {worker_id} leased job {job.job_id} for {job.username} (attempt {job.attempts})')
+        session = threading.Thread(
+            target=process_job,
+            args=(broker, job, check, visibility_timeout),
+            name=f'check-{job.job_id}',
+            daemon=True,
+        )
+        session.start()
+        sessions.append(session)
+        started += 1
+        if capacity:
+            capacity.session_started()
+            # Let the new browser start before measuring the host again
+            stop.wait(poll_interval)
+        else:
+            session.join()
+    for session in sessions:
+        session.join()
+    return started
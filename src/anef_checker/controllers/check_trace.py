@@ -0,0 +1,203 @@
+"""Performance tracing of status checks.
+
+When tracing is enabled, Chrome records its DevTools network events in the
+WebDriver performance log. They are collected after each phase of the check
+(``login``, ``navigate_to_status_page``, ``get_application_status``), written to
+disk as JSON lines for offline inspection, and condensed into a
+:class:`TraceSummary`: the slowest requests, total bytes transferred, time until
+the dossier response arrived, and time spent in WebDriver waits.
+
+The events include the login form and session cookies, so request bodies,
+credential headers and cookie lists are removed by :func:`redact_performance_entry`
+as soon as they are collected.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import (
+    Any,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Optional,
+)
+
+from pydantic import (
+    BaseModel,
+    computed_field,
+)
+
+DEFAULT_TOP_REQUESTS: Final[int] = 10
+DOSSIER_URL_MARKER: Final[str] = 'dossier'
+API_RESOURCE_TYPES: Final[frozenset[str]] = frozenset({'XHR', 'Fetch'})
+SENSITIVE_HEADERS: Final[frozenset[str]] = frozenset({'authorization', 'cookie', 'proxy-authorization', 'set-cookie'})
+# Request bodies, raw header blocks and cookie lists that DevTools attaches to network events
+SENSITIVE_FIELDS: Final[tuple[str, ...]] = (
+    'associatedCookies',
+    'blockedCookies',
+    'exemptedCookies',
+    'headersText',
+    'postData',
+    'postDataEntries',
+    'requestHeadersText',
+)
+
+
+class NetworkRequest(BaseModel):
+    """A network request reconstructed from DevTools events; times are in seconds from the first request."""
+
+    request_id: str
+    url: str
+    method: str = 'GET'
+    resource_type: Optional[str] = None
+    status: Optional[int] = None
+    start: float
+    response_at: Optional[float] = None
+    end: Optional[float] = None
+    encoded_bytes: int = 0
+    failed: bool = False
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def duration(self) -> Optional[float]:
+        """Time from sending the request to the end of its response, in seconds."""
+        return None if self.end is None else self.end - self.start
+
+
+class TraceSummary(BaseModel):
+    """Compact performance summary of a single status check."""
+
+    total_requests: int = 0
+    failed_requests: int = 0
+    total_bytes: int = 0
+    time_to_dossier: Optional[float] = None
+    wait_seconds: float = 0.0
+    phase_seconds: Dict[str, float] = {}
+    slowest_requests: List[NetworkRequest] = []
+
+
+def _network_events(entries: Iterable[Dict[str, Any]]) -> Iterable[tuple[str, Dict[str, Any]]]:
+    """Yield ``(method, params)`` of the DevTools network events in WebDriver performance log entries."""
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get('method', '')
+        if method.startswith('Network.'):
+            yield method, message.get('params', {})
+
+
+def _redact_fields(fields: Dict[str, Any]) -> None:
+    """Remove the request bodies, cookies and credential headers from a DevTools object, in place."""
+    for field in SENSITIVE_FIELDS:
+        fields.pop(field, None)
+    for headers_field in ('headers', 'requestHeaders'):
+        headers = fields.get(headers_field)
+        if isinstance(headers, dict):
+            fields[headers_field] = {
+                name: value for name, value in headers.items() if name.lower() not in SENSITIVE_HEADERS
+            }
+
+
+def redact_performance_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a WebDriver performance log entry without credentials, cookies or request bodies."""
+    try:
+        message = json.loads(entry['message'])
+        params = message['message']['params']
+    except (KeyError, TypeError, ValueError):
+        return entry
+    if not isinstance(params, dict):
+        return entry
+    _redact_fields(params)
+    for nested in ('request', 'response', 'redirectResponse'):
+        if isinstance(params.get(nested), dict):
+            _redact_fields(params[nested])
+    return {**entry, 'message': json.dumps(message)}
+
+
+def parse_network_requests(entries: Iterable[Dict[str, Any]]) -> List[NetworkRequest]:
+    """Rebuild the network requests of a check from its WebDriver performance log entries."""
+    requests: Dict[str, NetworkRequest] = {}
+    origin: Optional[float] = None
+    for method, params in _network_events(entries):
+        request_id = params.get('requestId')
+        timestamp = params.get('timestamp')
+        if request_id is None or timestamp is None:
+            continue
+        if origin is None:
+            origin = timestamp
+        elapsed = timestamp - origin
+
+        if method == 'Network.requestWillBeSent':
+            # Redirects reuse the request id; keep the original start time
+            previous = requests.get(request_id)
+            requests[request_id] = NetworkRequest(
+                request_id=request_id,
+                url=params.get('request', {}).get('url', ''),
+                method=params.get('request', {}).get('method', 'GET'),
+                resource_type=params.get('type'),
+                start=previous.start if previous else elapsed,
+            )
+        elif request_id in requests:
+            request = requests[request_id]
+            if method == 'Network.responseReceived':
+                request.status = params.get('response', {}).get('status')
+                request.response_at = elapsed
+                request.end = elapsed
+            elif method == 'Network.loadingFinished':
+                request.encoded_bytes = int(params.get('encodedDataLength', 0))
+                request.end = elapsed
+            elif method == 'Network.loadingFailed':
+                request.failed = True
+                request.end = elapsed
+    return sorted(requests.values(), key=lambda r: r.start)
+
+
+def summarize_performance_log(
+    entries: Iterable[Dict[str, Any]],
+    wait_seconds: float = 0.0,
+    phase_seconds: Optional[Dict[str, float]] = None,
+    top: int = DEFAULT_TOP_REQUESTS,
+) -> TraceSummary:
+    """Summarize the WebDriver performance log of a check."""
+    requests = parse_network_requests(entries)
+    dossier_responses = [
+        request.response_at
+        for request in requests
+        if request.response_at is not None
+        and request.resource_type in API_RESOURCE_TYPES
+        and DOSSIER_URL_MARKER in request.url.lower()
+    ]
+    return TraceSummary(
+        total_requests=len(requests),
+        failed_requests=sum(request.failed for request in requests),
+        total_bytes=sum(request.encoded_bytes for request in requests),
+        time_to_dossier=min(dossier_responses, default=None),
+        wait_seconds=wait_seconds,
+        phase_seconds=phase_seconds or {},
+        slowest_requests=sorted(
+            (request for request in requests if request.duration is not None),
+            key=lambda r: r.duration or 0.0,
+            reverse=True,
+        )[:top],
+    )
+
+
+def format_trace_summary(summary: TraceSummary) -> str:
+    """Format a trace summary for the logs."""
+    time_to_dossier = f'{summary.time_to_dossier:.2f}s' if summary.time_to_dossier is not None else 'n/a'
+    phases = ', '.join(f'{phase}={seconds:.2f}s' for phase, seconds in summary.phase_seconds.items())
+    lines = [
+        f'Requests: {summary.total_requests} ({summary.failed_requests} failed), {summary.total_bytes / 1024:.0f} KiB',
+        f'Time to dossier response: {time_to_dossier}, WebDriver waits: {summary.wait_seconds:.2f}s',
+        f'Phases: {phases}',
+        'Slowest requests:',
+    ]
+    lines.extend(
+        f'  {request.duration or 0.0:6.2f}s {request.encoded_bytes / 1024:8.0f} KiB {request.method} {request.url}'
+        for request in summary.slowest_requests
+    )
+    return '\n'.join(lines)
@@ -0,0 +1,149 @@
+"""Backends used by ``check_status_core`` to retrieve the raw application status.
+
+A backend takes ANEF credentials and returns the dossier dictionary that the
+ANEF website exposes (an empty dictionary when no status could be read). They
+are selected by name through :func:`get_checker_backend`:
+
+- ``selenium`` (default): logs in to the ANEF website with a real browser.
+- ``synthetic``: generates realistic dossiers without a browser, with
+  configurable latency and error rates, to load-test everything around the
+  browser (queueing, result processing, status descriptions, caching).
+
+Register other backends with :func:`register_checker_backend`. Only backends
+whose ``caches_results`` is true save their results as the last-known status of
+the account, so generated results never replace real ones.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+from datetime import (
+    date,
+    timedelta,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Protocol,
+)
+
+from anef_checker.controllers.database import load_default_status_database
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from anef_checker.constants.anef_enums import APICodeEnum
+    from anef_checker.controllers.anef_status_checker import ANEFCredentials
+
+DEFAULT_BACKEND: Final[str] = 'selenium'
+UNKNOWN_STATUS_CODE: Final[str] = 'STATUT_INCONNU'
+
+
+class CheckerBackend(Protocol):
+    """Retrieve the raw naturalization application status of an account."""
+
+    caches_results: bool
+
+    def check(self, credentials: ANEFCredentials, trace_dir: Optional[Path] = None) -> Dict[str, Any]:  # noqa: D102
+        ...
+
+
+class SeleniumBackend:
+    """Check the status on the ANEF website with a Chrome browser."""
+
+    caches_results = True
+
+    def check(self, credentials: ANEFCredentials, trace_dir: Optional[Path] = None) -> Dict[str, Any]:
+        """Log in to the ANEF website and read the dossier of the account."""
+        from anef_checker.controllers.anef_status_checker import check_naturalization_status
+
+        return check_naturalization_status(credentials, trace_dir=trace_dir)
+
+
+class SyntheticBackend:
+    """Generate realistic dossiers without a browser, for load testing.
+
+    Status codes are drawn from the status database, uniformly or with the given
+    weights. Each check sleeps for a log-normally distributed latency, and fails
+    with the configured rates: ``timeout_rate`` returns no dossier (as a browser
+    timeout does), ``error_rate`` raises ``RuntimeError`` and
+    ``unknown_code_rate`` returns a status code missing from the database.
+    Results are only cached with ``caches_results``, e.g. to load-test a throwaway cache.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        latency_mean: float = 0.0,
+        latency_sigma: float = 0.5,
+        timeout_rate: float = 0.0,
+        error_rate: float = 0.0,
+        unknown_code_rate: float = 0.0,
+        code_weights: Optional[Dict[APICodeEnum, float]] = None,
+        seed: Optional[int] = None,
+        caches_results: bool = False,
+    ) -> None:
+        """Configure the latency and error distributions of the generated checks."""
+        self.latency_mean = latency_mean
+        self.latency_sigma = latency_sigma
+        self.timeout_rate = timeout_rate
+        self.error_rate = error_rate
+        self.unknown_code_rate = unknown_code_rate
+        self.caches_results = caches_results
+        self.codes: List[APICodeEnum] = [status.api_code for status in load_default_status_database().statuses]
+        self.weights = [code_weights.get(code, 0.0) for code in self.codes] if code_weights else None
+        self._random = random.Random(seed)  # noqa: S311
+
+    def _sleep(self) -> None:
+        """Wait for a log-normal latency whose mean is ``latency_mean``."""
+        if self.latency_mean <= 0:
+            return
+        mu = math.log(self.latency_mean) - self.latency_sigma**2 / 2
+        time.sleep(self._random.lognormvariate(mu, self.latency_sigma))
+
+    def check(self, credentials: ANEFCredentials, trace_dir: Optional[Path] = None) -> Dict[str, Any]:  # noqa: ARG002
+        """Return a generated dossier for the account."""
+        self._sleep()
+        outcome = self._random.random()
+        if outcome < self.error_rate:
+            raise RuntimeError('Synthetic backend error')
+        if outcome < self.error_rate + self.timeout_rate:
+            return {}
+
+        if self._random.random() < self.unknown_code_rate:
+            status = UNKNOWN_STATUS_CODE
+        else:
+            status = self._random.choices(self.codes, weights=self.weights)[0].name
+        status_date = date.today() - timedelta(days=self._random.randint(0, 720))  # noqa: DTZ011
+        return {
+            'statut': status,
+            'date_statut': status_date.isoformat(),
+            'numero_national': f'{status_date.year}X{self._random.randint(0, 999999):06d}',
+        }
+
+
+CHECKER_BACKENDS: Dict[str, Callable[..., CheckerBackend]] = {
+    'selenium': SeleniumBackend,
+    'synthetic': SyntheticBackend,
+}
+
+
+def register_checker_backend(name: str, factory: Callable[..., CheckerBackend]) -> None:
+    """Register a checker backend under ``name``."""
+    CHECKER_BACKENDS[name] = factory
+
+
+def get_checker_backend(name: Optional[str] = None, **options: Any) -> CheckerBackend:  # noqa: ANN401
+    """Create the backend registered as ``name``, defaulting to ``ANEF_CHECKER_BACKEND`` or ``selenium``."""
+    name = name or os.getenv('ANEF_CHECKER_BACKEND') or DEFAULT_BACKEND
+    if name not in CHECKER_BACKENDS:
+        raise ValueError(f'Unknown checker backend: {name!r}')
+    return CHECKER_BACKENDS[name](**options)
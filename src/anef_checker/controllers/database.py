@@ -22,6 +22,7 @@ Expected JSON structure:
 
 from __future__ import annotations
 
+import functools
 import importlib.resources
 import json
 from pathlib import Path
@@ -106,8 +107,9 @@ def get_status_description(
     return ''
 
 
+@functools.lru_cache(maxsize=1)
 def load_default_status_database() -> StatusDatabase:
-    """Load the default status database."""
+    """Load the default status database, reading the packaged file only once."""
     return load_status_database(get_database_path())
 
 
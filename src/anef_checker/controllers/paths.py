@@ -0,0 +1,15 @@
+"""Filesystem locations used by the anef_checker package."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+def get_cache_dir() -> Path:
+    """Return the per-user cache directory, honouring ``ANEF_CACHE_DIR`` and ``XDG_CACHE_HOME``."""
+    if cache_dir := os.getenv('ANEF_CACHE_DIR'):
+        return Path(cache_dir)
+    xdg_cache_home = os.getenv('XDG_CACHE_HOME')
+    base_path = Path(xdg_cache_home) if xdg_cache_home else Path.home() / '.cache'
+    return base_path / 'anef_checker'
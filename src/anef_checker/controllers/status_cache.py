@@ -0,0 +1,115 @@
+"""Last-known status cache.
+
+Stores the latest successful :class:`StatusCheckResult` of each account so the
+CLI and the GUI can answer instantly while a fresh check runs, or instead of it.
+Each account has its own file, named after a hash of the username so the cache
+does not list the accounts it holds. Files are replaced atomically, so several
+processes can check accounts concurrently without losing or corrupting entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import tempfile
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+from pydantic import (
+    BaseModel,
+    ValidationError,
+)
+
+from anef_checker.constants.anef_enums import LanguageEnum  # noqa: TC001
+from anef_checker.controllers.database import get_status_description
+from anef_checker.controllers.paths import get_cache_dir
+from anef_checker.models.anef_status import StatusCheckResult  # noqa: TC001
+
+
+class CachedStatus(BaseModel):
+    """Last successful status check of an account."""
+
+    result: StatusCheckResult
+    language: LanguageEnum
+    checked_at: datetime
+
+    @property
+    def age(self) -> timedelta:
+        """Time elapsed since the status was checked."""
+        return datetime.now(tz=timezone.utc) - self.checked_at
+
+    def to_result(self, language: LanguageEnum) -> StatusCheckResult:
+        """Return the cached status as a result, translating its description if needed."""
+        result = self.result.model_copy(update={'from_cache': True, 'checked_at': self.checked_at})
+        if self.language != language and result.api_code:
+            description = get_status_description(api_code=result.api_code, lang=language)
+            result.description = description or result.api_code.value
+        return result
+
+
+def get_status_cache_dir() -> Path:
+    """Return the directory of the last-known status cache."""
+    return get_cache_dir() / 'last_status'
+
+
+def _cache_path(username: str, cache_dir: Optional[Path] = None) -> Path:
+    """Return the cache file of an account."""
+    key = hashlib.sha256(username.strip().lower().encode()).hexdigest()
+    return (cache_dir or get_status_cache_dir()) / f'{key}.json'
+
+
+def load_cached_status(username: str, cache_dir: Optional[Path] = None) -> Optional[CachedStatus]:
+    """Return the last-known status of ``username``, if any."""
+    path = _cache_path(username, cache_dir)
+    try:
+        return CachedStatus.model_validate_json(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValidationError) as e:
+        logger.warning(f'Ignoring unreadable status cache entry {path}: {e}')
+        return None
+
+
+def save_cached_status(
+    username: str,
+    result: StatusCheckResult,
+    language: LanguageEnum,
+    cache_dir: Optional[Path] = None,
+) -> Optional[CachedStatus]:
+    """Store a successful status check as the last-known status of ``username``.
+
+    Returns None if the cache could not be written; a cache failure never fails the check itself.
+    """
+    path = _cache_path(username, cache_dir)
+    entry = CachedStatus(
+        result=result.model_copy(update={'from_cache': False}),
+        language=language,
+        checked_at=result.checked_at or datetime.now(tz=timezone.utc),
+    )
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file unique to this writer, so readers never see a partial entry
+        with tempfile.NamedTemporaryFile(
+            'w',
+            encoding='utf-8',
+            dir=path.parent,
+            prefix=f'.{path.stem}.',
+            suffix='.tmp',
+            delete=False,
+        ) as tmp_file:
+            tmp_file.write(entry.model_dump_json())
+        tmp_path = Path(tmp_file.name)
+        try:
+            tmp_path.replace(path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        logger.warning(f'Could not save the last-known status to {path}: {e}')
+        return None
+    return entry
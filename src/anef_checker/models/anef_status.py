@@ -0,0 +1,21 @@
+"""Data models for the results of naturalization status checks."""
+
+from __future__ import annotations
+
+from datetime import datetime  # noqa: TC003
+from typing import Optional
+
+from pydantic import BaseModel
+
+from anef_checker.constants.anef_enums import APICodeEnum  # noqa: TC001
+
+
+class StatusCheckResult(BaseModel):
+    """Pydantic class to hold the status check result."""
+
+    success: bool
+    api_code: Optional[APICodeEnum] = None
+    description: Optional[str] = None
+    error_message: Optional[str] = None
+    checked_at: Optional[datetime] = None
+    from_cache: bool = False
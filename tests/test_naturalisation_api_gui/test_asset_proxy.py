@@ -0,0 +1,169 @@
+"""Tests for the ANEF static asset cache."""
+
+from __future__ import annotations
+
+import http.client
+import os
+import threading
+import urllib.request
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+
+from anef_checker.controllers.asset_proxy import (
+    AssetCache,
+    AssetCacheProxy,
+    CachedAsset,
+    freshness_lifetime,
+    is_cacheable_request,
+    is_cacheable_response,
+)
+
+
+def test_is_cacheable_request():
+    assert is_cacheable_request('GET', 'https://example.org/particuliers/main.js')
+    assert not is_cacheable_request('POST', 'https://example.org/particuliers/main.js')
+    assert not is_cacheable_request('GET', 'https://example.org/api/dossier.js')
+    assert not is_cacheable_request('GET', 'https://example.org/particuliers/')
+
+
+def test_asset_cache_evicts_least_recently_used(tmp_path):
+    cache = AssetCache(max_memory_bytes=10)
+    cache.put('a', CachedAsset(status=200, headers=[], body=b'12345'))
+    cache.put('b', CachedAsset(status=200, headers=[], body=b'12345'))
+    assert cache.get('a')
+    cache.put('c', CachedAsset(status=200, headers=[], body=b'12345'))
+    assert cache.get('b') is None
+    assert cache.get('a')
+    assert cache.memory_bytes == 10
+
+    disk_cache = AssetCache(cache_dir=tmp_path, max_memory_bytes=10)
+    disk_cache.put('a', CachedAsset(status=200, headers=[('Content-Type', 'text/css')], body=b'body'))
+    reloaded = AssetCache(cache_dir=tmp_path).get('a')
+    assert reloaded
+    assert reloaded.body == b'body'
+    assert reloaded.headers == [('Content-Type', 'text/css')]
+
+
+def test_freshness_lifetime():
+    assert freshness_lifetime([('Cache-Control', 'public, max-age=600, immutable')], now=0) == 600
+    assert freshness_lifetime([('Cache-Control', 'max-age=600'), ('Age', '100')], now=0) == 500
+    assert freshness_lifetime([('Cache-Control', 'no-cache, max-age=600')], now=0) == 0
+    assert freshness_lifetime(
+        [('Date', 'Mon, 19 Oct 2026 10:00:00 GMT'), ('Expires', 'Mon, 19 Oct 2026 11:00:00 GMT')],
+        now=0,
+    ) == 3600
+    assert freshness_lifetime([('Expires', '0')], now=0) == 0
+    assert not is_cacheable_response(200, [('Content-Type', 'text/css')], now=0)
+    assert is_cacheable_response(200, [('ETag', '"v1"')], now=0)
+    assert not is_cacheable_response(200, [('Cache-Control', 'private, max-age=600')], now=0)
+
+
+def test_refreshed_asset_keeps_body_and_updates_freshness():
+    asset = CachedAsset(status=200, headers=[('ETag', '"v1"'), ('Cache-Control', 'max-age=0')], body=b'body')
+    assert not asset.is_fresh(now=10)
+    assert asset.validators == {'If-None-Match': '"v1"'}
+
+    refreshed = asset.refreshed([('Cache-Control', 'max-age=60'), ('Content-Length', '0')], now=10)
+    assert refreshed.body == b'body'
+    assert refreshed.headers == [('ETag', '"v1"'), ('Cache-Control', 'max-age=60')]
+    assert refreshed.is_fresh(now=69)
+    assert not refreshed.is_fresh(now=70)
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = AssetCache(cache_dir=tmp_path, max_memory_bytes=0, max_disk_bytes=10)
+    cache.put('a', CachedAsset(status=200, headers=[], body=b'12345'))
+    cache.put('b', CachedAsset(status=200, headers=[], body=b'12345'))
+    os.utime(tmp_path / 'a.bin', (0, 0))
+    os.utime(tmp_path / 'b.bin', (1, 1))
+    assert cache.get('a')
+    cache.put('c', CachedAsset(status=200, headers=[], body=b'12345'))
+    assert cache.disk_bytes == 10
+    assert cache.get('b') is None
+    assert cache.get('a')
+    assert cache.get('c')
+    assert AssetCache(cache_dir=tmp_path, max_disk_bytes=5).disk_bytes == 5
+
+
+def test_proxy_serves_fresh_assets_and_revalidates_stale_ones(tmp_path):
+    upstream_requests = []
+
+    class Upstream(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            upstream_requests.append(self.headers.get('If-None-Match'))
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.send_header('Cache-Control', 'max-age=60')
+                self.end_headers()
+                return
+            body = b'console.log(1)'
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+            self.send_header('Cache-Control', 'max-age=0')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    upstream = ThreadingHTTPServer(('127.0.0.1', 0), Upstream)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{upstream.server_address[1]}/main.js'
+    try:
+        with AssetCacheProxy(cache_dir=tmp_path) as proxy:
+            opener = urllib.request.build_opener(urllib.request.ProxyHandler({'http': proxy.url}))
+            bodies = [opener.open(url, timeout=5).read() for _ in range(3)]
+            stats = proxy.stats
+    finally:
+        upstream.shutdown()
+        upstream.server_close()
+
+    assert bodies == [b'console.log(1)'] * 3
+    # Miss, then a revalidation of the stale copy, then a fresh hit without any upstream request
+    assert upstream_requests == [None, '"v1"']
+    assert (stats.misses, stats.hits, stats.revalidated) == (1, 2, 1)
+
+
+def test_proxy_reuses_upstream_connection_and_keeps_head_content_length(tmp_path):
+    upstream_clients = []
+
+    class Upstream(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):  # noqa: N802
+            upstream_clients.append(self.client_address)
+            body = b'{"statut": "dossier_depose"}'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        do_HEAD = do_GET  # noqa: N815
+
+        def log_message(self, *args):
+            pass
+
+    upstream = ThreadingHTTPServer(('127.0.0.1', 0), Upstream)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{upstream.server_address[1]}/api/dossier'
+    try:
+        with AssetCacheProxy(cache_dir=tmp_path) as proxy:
+            browser = http.client.HTTPConnection('127.0.0.1', proxy.port, timeout=5)
+            for _ in range(3):
+                browser.request('GET', url)
+                assert browser.getresponse().read() == b'{"statut": "dossier_depose"}'
+            browser.request('HEAD', url)
+            head = browser.getresponse()
+            head.read()
+            browser.close()
+    finally:
+        upstream.shutdown()
+        upstream.server_close()
+
+    assert len(upstream_clients) == 4
+    assert len(set(upstream_clients)) == 1
+    assert head.getheader('Content-Length') == '28'
@@ -0,0 +1,66 @@
+"""Tests for the host-aware session capacity controller."""
+
+from __future__ import annotations
+
+from anef_checker.controllers import capacity
+from anef_checker.controllers.capacity import (
+    MIB,
+    BrowserUsage,
+    CapacityController,
+    HostResources,
+)
+
+
+def test_target_sessions_is_bounded_by_memory_cpu_and_limits():
+    controller = CapacityController(min_sessions=1, max_sessions=6, memory_reserve_bytes=0)
+    controller.session_rss_bytes = 500 * MIB
+
+    controller.resources = HostResources(cpu_count=8, available_memory_bytes=1200 * MIB, load_average=1.0)
+    assert controller.update_target(active_sessions=2) == 4
+
+    controller.resources = HostResources(cpu_count=2, available_memory_bytes=8000 * MIB, load_average=1.0)
+    assert controller.update_target(active_sessions=2) == 2
+
+    controller.resources = HostResources(cpu_count=16, available_memory_bytes=8000 * MIB, load_average=20.0)
+    assert controller.update_target(active_sessions=3) == 2
+
+    controller.resources = HostResources(cpu_count=16, available_memory_bytes=100 * MIB)
+    assert controller.update_target(active_sessions=0) == 1
+
+
+def test_warming_sessions_are_reserved_and_not_sampled(monkeypatch):
+    now = [1000.0]
+    controller = CapacityController(
+        min_sessions=1,
+        max_sessions=8,
+        memory_reserve_bytes=0,
+        session_warmup_seconds=15,
+        clock=lambda: now[0],
+    )
+    controller.session_rss_bytes = 500 * MIB
+    resources = HostResources(cpu_count=8, available_memory_bytes=1200 * MIB, load_average=0.0)
+    monkeypatch.setattr(capacity, 'read_host_resources', lambda: resources)
+    usage = BrowserUsage(rss_bytes=100 * MIB, running_browsers=1)
+    monkeypatch.setattr(capacity, 'measure_browsers', lambda: usage)
+
+    # Two sessions just started, one of them still waiting for its browser
+    controller.session_started()
+    controller.session_started()
+    controller.observe(active_sessions=2)
+    assert controller.session_rss_bytes == 500 * MIB
+    assert controller.warming_sessions(active_sessions=2) == 2
+    assert controller.update_target(active_sessions=2) == 2
+    assert not controller.can_start_session(active_sessions=2)
+
+    # Both browsers are running, but one session is still within its warm-up
+    now[0] += 10
+    controller.session_started()
+    usage = BrowserUsage(rss_bytes=900 * MIB, running_browsers=3)
+    controller.observe(active_sessions=3)
+    assert controller.session_rss_bytes == 500 * MIB
+
+    # Once settled, the samples update the estimate and nothing is reserved
+    now[0] += 20
+    controller.observe(active_sessions=3)
+    assert controller.session_rss_bytes == 500 * MIB + 0.3 * (300 * MIB - 500 * MIB)
+    assert controller.warming_sessions(active_sessions=3) == 0
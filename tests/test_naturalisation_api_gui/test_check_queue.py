@@ -0,0 +1,105 @@
+"""Tests for the distributed check queue."""
+
+from __future__ import annotations
+
+from typer.testing import CliRunner
+
+from anef_checker.cli import cli
+from anef_checker.constants.anef_enums import JobStateEnum
+from anef_checker.controllers.check_queue import (
+    SQLiteCheckBroker,
+    open_broker,
+    process_job,
+    run_worker,
+    sqlite_path_from_url,
+)
+from anef_checker.models.anef_status import StatusCheckResult
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lease_is_exclusive_per_username_and_redelivered_on_expiry(tmp_path):
+    clock = FakeClock()
+    broker = SQLiteCheckBroker(tmp_path / 'queue.db', clock=clock)
+    first = broker.enqueue('alice', 'secret')
+    broker.enqueue('alice', 'secret')
+    other = broker.enqueue('bob', 'secret')
+
+    job = broker.lease('worker-1', visibility_timeout=60)
+    assert job.job_id == first
+    assert broker.lease('worker-2', visibility_timeout=60).job_id == other
+    assert broker.lease('worker-3', visibility_timeout=60) is None
+
+    clock.now += 61
+    redelivered = broker.lease('worker-3', visibility_timeout=60)
+    assert redelivered.job_id == first
+    assert redelivered.attempts == 2
+    assert not broker.complete(first, job.lease_token, {'success': True})
+    assert broker.complete(first, redelivered.lease_token, {'success': True})
+
+    done = broker.get_job(first)
+    assert done.state == JobStateEnum.DONE
+    assert done.result == {'success': True}
+    assert done.password.get_secret_value() == ''
+
+
+def test_worker_retries_then_fails(tmp_path):
+    broker = SQLiteCheckBroker(tmp_path / 'queue.db')
+    job_id = broker.enqueue('alice', 'secret', max_attempts=2)
+
+    def check(job):
+        raise RuntimeError('browser crashed')
+
+    assert run_worker(broker, check, poll_interval=0, max_jobs=2) == 2
+    job = broker.get_job(job_id)
+    assert job.state == JobStateEnum.FAILED
+    assert job.attempts == 2
+    assert job.error == 'browser crashed'
+
+
+def test_failed_status_check_is_requeued(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        cli,
+        'check_status_core',
+        lambda *args: StatusCheckResult(success=False, error_message='No response received from server.'),
+    )
+    broker = SQLiteCheckBroker(tmp_path / 'queue.db')
+    job_id = broker.enqueue('alice', 'secret', max_attempts=3)
+
+    process_job(broker, broker.lease('worker-1', visibility_timeout=60), cli.check_job)
+    job = broker.get_job(job_id)
+    assert job.state == JobStateEnum.PENDING
+    assert job.error == 'No response received from server.'
+
+
+def test_broker_urls_and_paths(tmp_path):
+    assert sqlite_path_from_url('sqlite:///var/lib/anef/queue.db').as_posix() == '/var/lib/anef/queue.db'
+    assert sqlite_path_from_url('sqlite:///C:/Users/me/queue.db').as_posix() == 'C:/Users/me/queue.db'
+    assert sqlite_path_from_url('sqlite:///C:/My%20Files/queue.db').as_posix() == 'C:/My Files/queue.db'
+
+    broker = open_broker(str(tmp_path / 'queue.db'))
+    assert isinstance(broker, SQLiteCheckBroker)
+    assert broker.db_path == tmp_path / 'queue.db'
+
+
+def test_enqueue_rejects_csv_without_credentials(tmp_path):
+    queue = tmp_path / 'queue.db'
+    accounts = tmp_path / 'accounts.csv'
+    accounts.write_text('login,password\nalice,secret\n', encoding='utf-8')
+    result = CliRunner().invoke(cli.app, ['enqueue', str(accounts), '--queue', str(queue)])
+    assert result.exit_code == 1
+    assert not isinstance(result.exception, KeyError)
+
+    accounts.write_text('username,password\nalice,secret\nbob,\n', encoding='utf-8')
+    assert CliRunner().invoke(cli.app, ['enqueue', str(accounts), '--queue', str(queue)]).exit_code == 1
+    assert not queue.exists()
+
+    accounts.write_text('username,password\nalice,secret\n', encoding='utf-8')
+    assert CliRunner().invoke(cli.app, ['enqueue', str(accounts), '--queue', str(queue)]).exit_code == 0
+    assert len(SQLiteCheckBroker(queue).list_jobs()) == 1
@@ -0,0 +1,81 @@
+"""Tests for the performance trace summary of status checks."""
+
+from __future__ import annotations
+
+import json
+
+from anef_checker.controllers.anef_status_checker import (
+    ANEFCredentials,
+    ANEFStatusChecker,
+)
+from anef_checker.controllers.check_trace import summarize_performance_log
+
+
+def network_event(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}}), 'timestamp': 0}
+
+
+def test_summarize_performance_log():
+    entries = [
+        network_event('Network.requestWillBeSent', requestId='1', timestamp=100.0, type='Document',
+                      request={'url': 'https://example.org/', 'method': 'GET'}),
+        network_event('Network.requestWillBeSent', requestId='2', timestamp=100.5, type='Script',
+                      request={'url': 'https://example.org/main.js', 'method': 'GET'}),
+        network_event('Network.loadingFinished', requestId='1', timestamp=101.0, encodedDataLength=1000),
+        network_event('Network.loadingFinished', requestId='2', timestamp=103.5, encodedDataLength=5000),
+        network_event('Network.requestWillBeSent', requestId='3', timestamp=104.0, type='XHR',
+                      request={'url': 'https://example.org/api/dossier', 'method': 'GET'}),
+        network_event('Network.responseReceived', requestId='3', timestamp=104.5, response={'status': 200}),
+        network_event('Network.loadingFinished', requestId='3', timestamp=104.75, encodedDataLength=200),
+        network_event('Page.loadEventFired', timestamp=105.0),
+    ]
+
+    summary = summarize_performance_log(entries, wait_seconds=2.5, top=2)
+
+    assert summary.total_requests == 3
+    assert summary.total_bytes == 6200
+    assert summary.time_to_dossier == 4.5
+    assert summary.wait_seconds == 2.5
+    assert [request.url for request in summary.slowest_requests] == [
+        'https://example.org/main.js',
+        'https://example.org/',
+    ]
+
+
+def test_trace_does_not_contain_credentials(tmp_path):
+    login_body = 'username=alice%40example.com&password=hunter2'
+    entries = [
+        network_event('Network.requestWillBeSent', requestId='1', timestamp=100.0, type='Document',
+                      request={'url': 'https://example.org/login', 'method': 'POST', 'postData': login_body,
+                               'postDataEntries': [{'bytes': 'aHVudGVyMg=='}],
+                               'headers': {'Content-Type': 'application/x-www-form-urlencoded'}}),
+        network_event('Network.requestWillBeSentExtraInfo', requestId='1',
+                      headers={'Cookie': 'SESSION=secret-session', 'authorization': 'Bearer secret-token'},
+                      associatedCookies=[{'cookie': {'name': 'SESSION', 'value': 'secret-session'}}]),
+        network_event('Network.responseReceivedExtraInfo', requestId='1', headers={'Set-Cookie': 'SESSION=next'},
+                      headersText='HTTP/1.1 302 Found\r\nSet-Cookie: SESSION=next\r\n'),
+        network_event('Network.responseReceived', requestId='1', timestamp=100.5, type='Document',
+                      response={'status': 302, 'headers': {'Location': '/home'},
+                                'requestHeaders': {'Cookie': 'SESSION=secret-session'}}),
+    ]
+
+    class FakeDriver:
+        def get_log(self, log_type):
+            return entries
+
+    checker = ANEFStatusChecker(
+        credentials=ANEFCredentials(username='alice@example.com', password='hunter2'),
+        trace_dir=tmp_path,
+    )
+    checker._driver = FakeDriver()
+    with checker.trace_phase('login'):
+        pass
+    checker._driver = None
+    summary = checker.write_trace()
+
+    trace = next(tmp_path.glob('*-performance.jsonl')).read_text(encoding='utf-8')
+    for secret in ('hunter2', 'aHVudGVyMg==', 'secret-session', 'secret-token', 'SESSION=next'):
+        assert secret not in trace
+    assert 'application/x-www-form-urlencoded' in trace
+    assert '/home' in trace
+    assert summary.total_requests == 1
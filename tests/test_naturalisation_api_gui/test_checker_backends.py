@@ -0,0 +1,48 @@
+"""Tests for the checker backends."""
+
+from __future__ import annotations
+
+from anef_checker.cli.cli import check_status_core
+from anef_checker.controllers.checker_backends import (
+    SyntheticBackend,
+    get_checker_backend,
+)
+from anef_checker.controllers.status_cache import load_cached_status
+
+
+def test_synthetic_backend_through_check_status_core(monkeypatch, tmp_path):
+    monkeypatch.setenv('ANEF_CACHE_DIR', str(tmp_path))
+    backend = SyntheticBackend(seed=1)
+    results = [check_status_core(f'user{i}', 'password', None, backend=backend) for i in range(20)]
+    assert all(result.success and result.api_code in backend.codes for result in results)
+
+    failing = SyntheticBackend(timeout_rate=0.5, error_rate=0.5, seed=1)
+    results = [check_status_core('user', 'password', None, backend=failing) for _ in range(20)]
+    assert not any(result.success for result in results)
+    assert {result.error_message for result in results} == {
+        'No response received from server.',
+        'Error checking status: Synthetic backend error',
+    }
+
+    unknown = SyntheticBackend(unknown_code_rate=1.0, seed=1)
+    assert check_status_core('user', 'password', None, backend=unknown).error_message.startswith('Unknown status code')
+
+    assert isinstance(get_checker_backend('synthetic'), SyntheticBackend)
+
+
+def test_backend_results_are_cached_only_when_the_backend_allows_it(monkeypatch, tmp_path):
+    monkeypatch.setenv('ANEF_CACHE_DIR', str(tmp_path / 'user-cache'))
+    assert check_status_core('user', 'password', None, backend=SyntheticBackend(seed=1)).success
+    assert load_cached_status('user') is None
+
+    cache_dir = tmp_path / 'load-test-cache'
+    backend = SyntheticBackend(seed=1, caches_results=True)
+    result = check_status_core('user', 'password', None, backend=backend, cache_dir=cache_dir)
+    assert load_cached_status('user', cache_dir=cache_dir).result.api_code == result.api_code
+    assert load_cached_status('user') is None
+
+
+def test_unknown_backend_is_reported_as_a_failed_check():
+    result = check_status_core('user', 'password', None, backend='nope')
+    assert not result.success
+    assert result.error_message == "Unknown checker backend: 'nope'"
@@ -0,0 +1,58 @@
+"""Tests for the last-known status cache."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+
+from anef_checker.constants.anef_enums import (
+    APICodeEnum,
+    LanguageEnum,
+)
+from anef_checker.controllers.status_cache import (
+    load_cached_status,
+    save_cached_status,
+)
+from anef_checker.models.anef_status import StatusCheckResult
+
+
+def test_cached_status_round_trip_and_translation(tmp_path):
+    checked_at = datetime.now(tz=timezone.utc) - timedelta(hours=2)
+    result = StatusCheckResult(
+        success=True,
+        api_code=APICodeEnum.CONTROLE_A_EFFECTUER,
+        description='Description en français',
+        checked_at=checked_at,
+    )
+    save_cached_status('User@example.com', result, LanguageEnum.FR, cache_dir=tmp_path)
+
+    assert load_cached_status('someone-else', cache_dir=tmp_path) is None
+    cached = load_cached_status('user@example.com', cache_dir=tmp_path)
+    assert cached.checked_at == checked_at
+    assert timedelta(hours=2) <= cached.age < timedelta(hours=3)
+
+    same_language = cached.to_result(LanguageEnum.FR)
+    assert same_language.from_cache
+    assert same_language.description == 'Description en français'
+    assert cached.to_result(LanguageEnum.EN).description != 'Description en français'
+
+
+def test_concurrent_saves_keep_every_account(tmp_path):
+    result = StatusCheckResult(success=True, api_code=APICodeEnum.CONTROLE_A_EFFECTUER, description='Description')
+    usernames = [f'user{i}@example.com' for i in range(50)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda u: save_cached_status(u, result, LanguageEnum.FR, cache_dir=tmp_path), usernames * 2))
+
+    assert all(load_cached_status(username, cache_dir=tmp_path) for username in usernames)
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_unwritable_cache_does_not_raise(tmp_path):
+    blocker = tmp_path / 'not-a-directory'
+    blocker.write_text('')
+    result = StatusCheckResult(success=True, api_code=APICodeEnum.CONTROLE_A_EFFECTUER, description='Description')
+    assert save_cached_status('user@example.com', result, LanguageEnum.FR, cache_dir=blocker) is None